@@ -1,12 +1,11 @@
 import streamlit as st
-from interactive_viewer import InteractiveViewer
+from figure_cache import interactive_viewer_figure
 
 def main():
     st.title("Interactive 3D Black Hole")
     
     if st.button("Show Interactive Simulation"):
-        viewer = InteractiveViewer()
-        st.plotly_chart(viewer.fig, use_container_width=True)
+        st.plotly_chart(interactive_viewer_figure(), use_container_width=True)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,76 @@
+"""Brute-force vs BVH closest-hit timing over growing scene sizes
+
+Run with: python -m benchmarks.bvh_crossover
+"""
+import time
+import numpy as np
+from numba import njit
+from physics.bvh import BVH, bvh_closest_hit
+from physics.raytracing import closest_hit, object_dtype
+
+def random_scene(n, extent=50.0, seed=0):
+    rng = np.random.default_rng(seed)
+    objects_array = np.zeros(n, dtype=object_dtype)
+    objects_array['position'] = rng.uniform(-extent, extent, (n, 3))
+    objects_array['radius'] = rng.uniform(0.05, 0.5, n) * extent / max(n, 1)**(1/3)
+    objects_array['color'] = rng.uniform(0, 1, (n, 3))
+    return objects_array
+
+def random_rays(n, extent=50.0, seed=1):
+    rng = np.random.default_rng(seed)
+    origins = np.zeros((n, 3))
+    origins[:, 2] = 2 * extent
+    targets = rng.uniform(-extent, extent, (n, 3))
+    dirs = targets - origins
+    return origins, dirs / np.linalg.norm(dirs, axis=1)[:, None]
+
+@njit
+def _brute_force(origins, dirs, objects_array):
+    hits = 0
+    for r in range(len(origins)):
+        if closest_hit(origins[r], dirs[r], objects_array)[1] != -1:
+            hits += 1
+    return hits
+
+@njit
+def _bvh(origins, dirs, objects_array, nodes, indices):
+    hits = 0
+    for r in range(len(origins)):
+        if bvh_closest_hit(origins[r], dirs[r], objects_array, nodes, indices)[1] != -1:
+            hits += 1
+    return hits
+
+def best_of(fn, *args, repeat=3):
+    fn(*args)  # JIT warm-up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def run(sizes=(1, 4, 16, 64, 256, 1024, 4096, 16384), num_rays=5000):
+    """Yield (objects, brute s/ray, bvh s/ray, build s) for each scene size"""
+    origins, dirs = random_rays(num_rays)
+    for n in sizes:
+        objects_array = random_scene(n)
+        start = time.perf_counter()
+        bvh = BVH(objects_array)
+        build = time.perf_counter() - start
+        brute = best_of(_brute_force, origins, dirs, objects_array)
+        accel = best_of(_bvh, origins, dirs, objects_array, *bvh.arrays)
+        yield n, brute / num_rays, accel / num_rays, build
+
+def main():
+    print(f"{'objects':>8} {'brute ns/ray':>14} {'bvh ns/ray':>12} {'build s':>9}")
+    crossover = None
+    for n, brute, accel, build in run():
+        print(f"{n:>8} {brute*1e9:>14.1f} {accel*1e9:>12.1f} {build:>9.4f}")
+        if accel >= brute:
+            crossover = None
+        elif crossover is None:
+            crossover = n
+    print(f"BVH stays faster from {crossover} objects" if crossover else "BVH never faster")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Import time and time-to-first-frame, each measured in a fresh interpreter
+
+Run with: python -m benchmarks.cold_start
+
+The first-frame case runs twice against an empty NUMBA_CACHE_DIR: the first
+run compiles the kernels, the second loads them from the on-disk cache.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ('numba', 'scipy', 'streamlit')
+
+# Measured before lazy imports and the kernel cache, on the same dev box
+BEFORE = {
+    'import physics': 0.76,
+    'import visualization': 1.18,
+    'import interactive_viewer': 0.72,
+    'first frame': 6.7
+}
+
+# Goals; heavy modules must stay out of the viewer import altogether
+TARGETS = {
+    'import physics': 0.05,
+    'import visualization': 0.05,
+    'import interactive_viewer': 0.3,
+    'first frame (cached)': 1.5
+}
+
+CASES = {
+    'import physics': 'import physics',
+    'import visualization': 'import visualization',
+    'import interactive_viewer': 'import interactive_viewer',
+    'import plotly_blackhole': 'import plotly_blackhole',
+    'first frame': (
+        'from visualization import Renderer\n'
+        'from physics import CelestialObject\n'
+        'Renderer(64, 48).render_parallel([CelestialObject([0, 0, -3], 1, [1, 0, 0])])'
+    )
+}
+
+PROBE = '''
+import sys, time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+print(elapsed, ','.join(m for m in {heavy!r} if m in sys.modules) or '-')
+'''
+
+def measure(code, env):
+    out = subprocess.run([sys.executable, '-c', PROBE.format(code=code, heavy=HEAVY_MODULES)],
+                         cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    elapsed, loaded = out.stdout.split()[-2:]
+    return float(elapsed), '' if loaded == '-' else loaded
+
+def main():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(os.environ, NUMBA_CACHE_DIR=cache_dir, PYTHONPATH=ROOT)
+        results = {}
+        for name, code in CASES.items():
+            results[name] = measure(code, env)
+            if name == 'first frame':
+                results['first frame (cached)'] = measure(code, env)
+
+    print(f"{'case':<28} {'seconds':>8} {'before':>8} {'target':>8}  heavy modules loaded")
+    missed = 0
+    for name, (elapsed, loaded) in results.items():
+        target = TARGETS.get(name)
+        ok = target is None or elapsed <= target
+        if name in ('import interactive_viewer', 'import plotly_blackhole'):
+            ok = ok and not loaded
+        missed += not ok
+        print(f"{name:<28} {elapsed:>8.3f} {BEFORE.get(name, float('nan')):>8.2f} "
+              f"{target if target else float('nan'):>8.2f}  {loaded or '-'}{'' if ok else '  MISSED'}")
+    return 1 if missed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
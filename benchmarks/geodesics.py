@@ -0,0 +1,94 @@
+"""Accuracy check of BlackHole.bend_light_batch against bend_light
+
+Run with: python -m benchmarks.geodesics [--quick] [--escape-radius RS]
+
+Traces random planar rays starting 3-20 rs from the hole with both the
+fixed-step RK4 batch and the solve_ivp reference, then compares capture
+flags and, for rays both let escape, final directions. Exits with status 1
+if capture agreement falls below MIN_CAPTURE_AGREEMENT or an angle exceeds
+MAX_ANGLE_ERROR, so it can gate changes to the batch integrator.
+"""
+import argparse
+import sys
+import time
+import numpy as np
+
+# solve_ivp's default rtol=1e-3 is off by tens of degrees on rays grazing the photon sphere
+REFERENCE_RTOL = 1e-9
+REFERENCE_ATOL = 1e-12
+
+MAX_ANGLE_ERROR = 0.1  # degrees
+MIN_CAPTURE_AGREEMENT = 0.99
+
+MASSES = (1e26, 1e27, 1e28)  # rs from 0.15 to 15 scene units
+
+def random_rays(rs, n, seed=0):
+    """(origins, directions) in the plane of the geodesic model, 3-20 rs out"""
+    rng = np.random.default_rng(seed)
+    r = rng.uniform(3, 20, n) * rs
+    position_angle = rng.uniform(0, 2*np.pi, n)
+    direction_angle = rng.uniform(0, 2*np.pi, n)
+    origins = np.column_stack([r * np.cos(position_angle), r * np.sin(position_angle), np.zeros(n)])
+    directions = np.column_stack([np.cos(direction_angle), np.sin(direction_angle), np.zeros(n)])
+    return origins, directions
+
+def compare(reference_dirs, reference_captured, dirs, captured):
+    escaped = ~reference_captured & ~captured
+    cos_angle = np.clip(np.sum(reference_dirs[escaped] * dirs[escaped], axis=1), -1, 1)
+    angle = np.degrees(np.arccos(cos_angle))
+    return {
+        'capture_agreement': float(np.mean(reference_captured == captured)),
+        'captured': int(reference_captured.sum()),
+        'max_angle': float(angle.max()) if angle.size else 0.0,
+        'median_angle': float(np.median(angle)) if angle.size else 0.0
+    }
+
+def run(quick=False, escape_radius=None):
+    from physics.blackhole import BlackHole
+
+    n = 200 if quick else 2000
+    results = []
+    for mass in MASSES:
+        black_hole = BlackHole(mass)
+        rs = black_hole.schwarzschild_radius
+        origins, directions = random_rays(rs, n)
+
+        start = time.perf_counter()
+        reference = [black_hole.bend_light(o, d, return_captured=True,
+                                           rtol=REFERENCE_RTOL, atol=REFERENCE_ATOL)
+                     for o, d in zip(origins, directions)]
+        reference_time = time.perf_counter() - start
+        reference_dirs = np.array([r[0] for r in reference])
+        reference_captured = np.array([r[1] for r in reference])
+
+        black_hole.bend_light_batch(origins[:1], directions[:1])  # Compile outside the timing
+        start = time.perf_counter()
+        dirs, captured = black_hole.bend_light_batch(
+            origins, directions, escape_radius=None if escape_radius is None else escape_radius * rs)
+        batch_time = time.perf_counter() - start
+
+        result = dict(compare(reference_dirs, reference_captured, dirs, captured), mass=mass,
+                      bend_light=reference_time, bend_light_batch=batch_time)
+        result['passed'] = (result['capture_agreement'] >= MIN_CAPTURE_AGREEMENT
+                            and result['max_angle'] <= MAX_ANGLE_ERROR)
+        print(f"mass={mass:.0e}  rs {rs:<8.3g} captured {result['captured']:4d}/{n}  "
+              f"agreement {result['capture_agreement']:7.2%}  "
+              f"angle max {result['max_angle']:.3g} deg  median {result['median_angle']:.3g} deg  "
+              f"bend_light {reference_time:.3f}s  batch {batch_time:.3f}s  "
+              f"({reference_time / batch_time:.1f}x)  {'ok' if result['passed'] else 'FAIL'}",
+              flush=True)
+        results.append(result)
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--quick', action='store_true', help='fewer rays')
+    parser.add_argument('--escape-radius', type=float, default=None, metavar='RS',
+                        help='escape_radius for bend_light_batch in units of rs '
+                             '(default physics.geodesics.ESCAPE_RADIUS)')
+    args = parser.parse_args(argv)
+    results = run(args.quick, args.escape_radius)
+    return 0 if all(r['passed'] for r in results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,225 @@
+"""Offline benchmark and performance-regression suite
+
+Run with: python -m benchmarks.suite [--quick] [--output results.json]
+          [--baseline baseline.json] [--threshold 0.25] [--threshold trace_ray=0.5]
+
+Every benchmark runs over several scene sizes, so the JSON holds scaling
+curves as well as single numbers. With --baseline, any case slower than the
+baseline by more than its threshold is reported and the exit code is 1.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import numpy as np
+from numba import njit
+from benchmarks.bvh_crossover import random_scene, random_rays
+from physics.raytracing import trace_ray as trace_ray_kernel
+
+BENCHMARKS = []
+
+def benchmark(fn):
+    BENCHMARKS.append(fn)
+    return fn
+
+def measure(fn, repeat=5, warmup=1):
+    """Median and min wall time of fn() after warmup calls (JIT compiles there)"""
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), min(timings)
+
+def random_objects(n, seed=0):
+    from physics.objects import CelestialObject
+
+    objects_array = random_scene(n, extent=4.0, seed=seed)
+    objects_array['position'][:, 2] -= 8
+    return [CelestialObject(o['position'], o['radius'], o['color'], o['emission'])
+            for o in objects_array]
+
+@njit
+def _trace_batch(origins, dirs, objects_array, bh_pos, bh_mass):
+    total = 0.0
+    for r in range(len(origins)):
+        total += trace_ray_kernel(origins[r], dirs[r], objects_array, bh_pos, bh_mass)[0]
+    return total
+
+@benchmark
+def trace_ray(quick):
+    num_rays = 2000 if quick else 20000
+    origins, dirs = random_rays(num_rays)
+    for n in (1, 16, 256) if quick else (1, 16, 256, 4096):
+        objects_array = random_scene(n)
+        median, best = measure(lambda: _trace_batch(origins, dirs, objects_array, np.zeros(3), 0.0))
+        yield {'objects': n}, median / num_rays, best / num_rays, 's/ray'
+
+@benchmark
+def renderer_render(quick):
+    from visualization.renderer import Renderer
+
+    sizes = [(32, 24)] if quick else [(32, 24), (64, 48)]
+    for width, height in sizes:
+        for spp in (1, 2):
+            for n in (3, 64):
+                objects = random_objects(n)
+                renderer = Renderer(width, height)
+                median, best = measure(lambda: renderer.render(objects, samples_per_pixel=spp),
+                                       repeat=1 if quick else 3)
+                yield {'width': width, 'height': height, 'spp': spp, 'objects': n}, median, best, 's/frame'
+
+@benchmark
+def renderer_render_parallel(quick):
+    from visualization.renderer import Renderer
+
+    sizes = [(160, 120)] if quick else [(160, 120), (320, 240), (640, 480)]
+    for width, height in sizes:
+        for spp in (1, 4):
+            for n in (3, 64, 1024):
+                objects = random_objects(n)
+                renderer = Renderer(width, height)
+                median, best = measure(lambda: renderer.render_parallel(objects, samples_per_pixel=spp),
+                                       repeat=3)
+                yield {'width': width, 'height': height, 'spp': spp, 'objects': n}, median, best, 's/frame'
+
+@benchmark
+def bend_light(quick):
+    from physics.blackhole import BlackHole
+
+    black_hole = BlackHole(mass=1e27)
+    rs = black_hole.schwarzschild_radius
+    rng = np.random.default_rng(0)
+    for n in (10, 100) if quick else (10, 100, 1000):
+        origins = rng.uniform(3, 20, (n, 3)) * rs
+        dirs = rng.normal(size=(n, 3))
+        median, best = measure(lambda: [black_hole.bend_light(o, d) for o, d in zip(origins, dirs)],
+                               repeat=3)
+        yield {'rays': n}, median / n, best / n, 's/ray'
+
+@benchmark
+def bend_light_batch(quick):
+    from physics.blackhole import BlackHole
+
+    black_hole = BlackHole(mass=1e27)
+    rs = black_hole.schwarzschild_radius
+    rng = np.random.default_rng(0)
+    for n in (100, 1000) if quick else (100, 1000, 10000):
+        origins = rng.uniform(3, 20, (n, 3)) * rs
+        dirs = rng.normal(size=(n, 3))
+        median, best = measure(lambda: black_hole.bend_light_batch(origins, dirs), repeat=3)
+        yield {'rays': n}, median / n, best / n, 's/ray'
+
+@benchmark
+def prepare_objects(quick):
+    from physics.raytracing import prepare_objects as prepare
+
+    for n in (10, 1000) if quick else (10, 1000, 100000):
+        objects = random_objects(n)
+        median, best = measure(lambda: prepare(objects), repeat=3)
+        yield {'objects': n}, median, best, 's/call'
+
+@benchmark
+def interactive_viewer_figure(quick):
+    from interactive_viewer import InteractiveViewer
+
+    for n in (3, 100) if quick else (3, 100, 1000):
+        objects = random_objects(n)
+        median, best = measure(lambda: InteractiveViewer(objects=objects), repeat=3)
+        yield {'objects': n}, median, best, 's/figure'
+
+@benchmark
+def black_hole_visualizer_figure(quick):
+    from plotly_blackhole import BlackHoleVisualizer
+
+    for n in (300, 100000) if quick else (300, 100000, 1000000):
+        median, best = measure(lambda: BlackHoleVisualizer(num_stars=n), repeat=3)
+        yield {'stars': n}, median, best, 's/figure'
+
+def machine_metadata():
+    import numba
+
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'numba': numba.__version__
+    }
+
+def case_key(result):
+    params = ','.join(f'{k}={v}' for k, v in sorted(result['params'].items()))
+    return f"{result['name']}[{params}]"
+
+def run(quick=False, only=None):
+    results = []
+    for fn in BENCHMARKS:
+        if only and fn.__name__ not in only:
+            continue
+        for params, median, best, unit in fn(quick):
+            result = {'name': fn.__name__, 'params': params, 'median': median, 'min': best, 'unit': unit}
+            print(f"{case_key(result):<70} {median:>12.4g} {unit}", flush=True)
+            results.append(result)
+    return {'machine': machine_metadata(), 'results': results}
+
+def compare(report, baseline, default_threshold, thresholds):
+    """Cases whose median regressed past their threshold, as (key, ratio, threshold)"""
+    previous = {case_key(r): r for r in baseline['results']}
+    regressions = []
+    for result in report['results']:
+        key = case_key(result)
+        if key not in previous:
+            continue
+        ratio = result['median'] / previous[key]['median']
+        threshold = thresholds.get(result['name'], default_threshold)
+        if ratio > 1 + threshold:
+            regressions.append((key, ratio, threshold))
+    return regressions
+
+def parse_thresholds(values):
+    default, per_name = 0.25, {}
+    for value in values:
+        if '=' in value:
+            name, limit = value.split('=', 1)
+            per_name[name] = float(limit)
+        else:
+            default = float(value)
+    return default, per_name
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--quick', action='store_true', help='smaller sizes for a fast smoke run')
+    parser.add_argument('--only', nargs='*', help='benchmark names to run')
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--baseline', help='previous results JSON to compare against')
+    parser.add_argument('--threshold', action='append', default=[],
+                        help='allowed slowdown, e.g. 0.25 or trace_ray=0.5 (repeatable)')
+    args = parser.parse_args(argv)
+
+    report = run(args.quick, args.only)
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(report['results'])} results to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        default, per_name = parse_thresholds(args.threshold)
+        regressions = compare(report, baseline, default, per_name)
+        for key, ratio, threshold in regressions:
+            print(f"REGRESSION {key}: {ratio:.2f}x baseline (allowed {1 + threshold:.2f}x)")
+        if regressions:
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+
+class FigureCache:
+    def __init__(self, max_entries=32, max_bytes=256 * 2**20):
+        """Process-wide LRU of built Plotly figures, shared by all Streamlit sessions
+
+        Entries are evicted when either the entry count or the total serialized
+        size (a proxy for memory use) exceeds its limit.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()  # key -> (figure, size in bytes)
+        self._lock = threading.Lock()
+        self._building = {}  # key -> lock held while one session builds it
+
+    def get_or_build(self, key, build):
+        """Return the cached figure for key, calling build() once on a miss
+
+        Cached figures are shared between sessions and must not be mutated.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+            key_lock = self._building.setdefault(key, threading.Lock())
+
+        # Concurrent requests for the same key wait for a single build
+        with key_lock:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    return self._entries[key][0]
+
+            try:
+                fig = build()
+                size = len(fig.to_json())
+            finally:
+                with self._lock:
+                    self._building.pop(key, None)
+
+            with self._lock:
+                if size > self.max_bytes:
+                    return fig
+                self._entries[key] = (fig, size)
+                self.total_bytes += size
+                while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                    _, (_, evicted_size) = self._entries.popitem(last=False)
+                    self.total_bytes -= evicted_size
+            return fig
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+figure_cache = FigureCache()
+
+def _vector_key(values):
+    return tuple(float(v) for v in np.ravel(values))
+
+def objects_key(objects):
+    """Hashable key for a list of CelestialObject"""
+    return tuple((_vector_key(obj.position), float(obj.radius), _vector_key(obj.color),
+                  float(obj.emission)) for obj in objects)
+
+def interactive_viewer_figure(mass=1e31, position=[0, 0, 0], objects=None, disk_resolution=100):
+    """Cached InteractiveViewer figure for these scene parameters"""
+    from interactive_viewer import InteractiveViewer, default_objects
+
+    objects = default_objects() if objects is None else objects
+    key = ('InteractiveViewer', float(mass), _vector_key(position), objects_key(objects),
+           int(disk_resolution))
+    return figure_cache.get_or_build(
+        key, lambda: InteractiveViewer(mass, position, objects, disk_resolution).fig)
+
+def black_hole_visualizer_figure(mass=10, position=[0, 0, 0], num_stars=300, star_budget=20000):
+    """Cached BlackHoleVisualizer figure for these parameters"""
+    from plotly_blackhole import BlackHoleVisualizer
+
+    key = ('BlackHoleVisualizer', float(mass), _vector_key(position), int(num_stars),
+           int(star_budget))
+    return figure_cache.get_or_build(
+        key, lambda: BlackHoleVisualizer(mass, position, num_stars, star_budget).fig)
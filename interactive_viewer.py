@@ -2,24 +2,31 @@ import numpy as np
 import plotly.graph_objects as go
 from physics.blackhole import BlackHole
 from physics.objects import CelestialObject
+from physics.scene import Scene
+
+def default_objects():
+    return [
+        CelestialObject(position=[-2, 0, -5], radius=0.5, color=[1, 0, 0]),
+        CelestialObject(position=[2, 0, -5], radius=0.5, color=[0, 1, 0]),
+        CelestialObject(position=[0, 3, -5], radius=0.5, color=[0, 0, 1])
+    ]
 
 class InteractiveViewer:
-    def __init__(self):
+    def __init__(self, mass=1e31, position=[0, 0, 0], objects=None, disk_resolution=100):
+        self.mass = mass
+        self.position = position
+        self.objects = default_objects() if objects is None else objects
+        self.disk_resolution = disk_resolution
         self.fig = go.Figure()
         self.setup_scene()
         
     def setup_scene(self):
         # Create black hole
-        black_hole = BlackHole(mass=1e31)
+        black_hole = BlackHole(mass=self.mass, position=self.position)
         self.add_black_hole(black_hole)
         
         # Add some celestial objects
-        objects = [
-            CelestialObject(position=[-2, 0, -5], radius=0.5, color=[1, 0, 0]),
-            CelestialObject(position=[2, 0, -5], radius=0.5, color=[0, 1, 0]),
-            CelestialObject(position=[0, 3, -5], radius=0.5, color=[0, 0, 1])
-        ]
-        self.add_objects(objects)
+        self.add_objects(self.objects)
         
         # Set up layout
         self.fig.update_layout(
@@ -51,7 +58,7 @@ class InteractiveViewer:
         )
         
         # Add accretion disk (simplified)
-        theta = np.linspace(0, 2*np.pi, 100)
+        theta = np.linspace(0, 2*np.pi, self.disk_resolution)
         x = black_hole.position[0] + 3 * np.cos(theta)
         y = black_hole.position[1] + 3 * np.sin(theta)
         z = np.full_like(theta, black_hole.position[2])
@@ -68,6 +75,9 @@ class InteractiveViewer:
         )
     
     def add_objects(self, objects):
+        if isinstance(objects, Scene):
+            self.add_scene(objects)
+            return
         for obj in objects:
             self.fig.add_trace(
                 go.Scatter3d(
@@ -84,6 +94,26 @@ class InteractiveViewer:
                 )
             )
     
+    def add_scene(self, scene):
+        """All objects of a Scene as one trace, read straight from its array"""
+        objects_array = scene.array
+        positions = objects_array['position']
+        rgb = np.clip(objects_array['color'] * 255, 0, 255).astype(int)
+        self.fig.add_trace(
+            go.Scatter3d(
+                x=positions[:, 0],
+                y=positions[:, 1],
+                z=positions[:, 2],
+                mode='markers',
+                marker=dict(
+                    size=objects_array['radius']*20,  # Scale for visibility
+                    color=[f'rgb({r},{g},{b})' for r, g, b in rgb],
+                    opacity=0.8
+                ),
+                name='Scene objects'
+            )
+        )
+    
     def show(self):
         self.fig.show()
 
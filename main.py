@@ -1,12 +1,20 @@
 import streamlit as st
-from interactive_viewer import InteractiveViewer
+from figure_cache import interactive_viewer_figure
 
 def main():
     st.title("Spatial Debug View: Accretion Disk and Object Coordinates")
     
     if st.button("Show Interactive Simulation"):
-        viewer = InteractiveViewer()
-        st.plotly_chart(viewer.fig, use_container_width=True)
+        st.plotly_chart(interactive_viewer_figure(), use_container_width=True)
+    
+    if st.sidebar.checkbox("Show render statistics"):
+        from interactive_viewer import default_objects
+        from visualization.renderer import Renderer
+        from visualization.instrumentation import show_render_stats
+        
+        renderer = Renderer(width=160, height=120, instrument=True)
+        st.sidebar.image(renderer.render_parallel(default_objects()), caption="Ray-traced preview")
+        show_render_stats(renderer.last_stats)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,72 @@
+import numpy as np
+import plotly.graph_objects as go
+from interactive_viewer import InteractiveViewer
+
+class OrbitAnimation:
+    def __init__(self, store, viewer=None, frame_stride=1, frame_duration=50):
+        """Plotly animation of a TrajectoryStore over the static InteractiveViewer scene
+
+        Each frame carries only the float32 coordinates of the single bodies
+        trace; markers, colors and the static traces are emitted once.
+        """
+        self.viewer = viewer if viewer is not None else InteractiveViewer(objects=[])
+        self.fig = self.viewer.fig
+        self.store = store
+        self.frame_stride = frame_stride
+        self.frame_duration = frame_duration
+        self.build()
+
+    def build(self):
+        frames = self.store.frames[::self.frame_stride]
+        first = np.asarray(frames[0], dtype=np.float32)
+
+        self.fig.add_trace(go.Scatter3d(
+            x=first[:, 0], y=first[:, 1], z=first[:, 2],
+            mode='markers',
+            marker=dict(size=3, color='white', opacity=0.8),
+            name='Orbiting bodies',
+            hoverinfo='none'
+        ))
+        body_trace = len(self.fig.data) - 1
+
+        self.fig.frames = [
+            go.Frame(
+                data=[go.Scatter3d(x=p[:, 0], y=p[:, 1], z=p[:, 2])],
+                traces=[body_trace],
+                name=str(i)
+            )
+            for i, p in enumerate(np.asarray(f, dtype=np.float32) for f in frames)
+        ]
+
+        play = dict(frame=dict(duration=self.frame_duration, redraw=True),
+                    transition=dict(duration=0), fromcurrent=True, mode='immediate')
+        self.fig.update_layout(
+            updatemenus=[dict(type='buttons', showactive=False, buttons=[
+                dict(label='Play', method='animate', args=[None, play]),
+                dict(label='Pause', method='animate',
+                     args=[[None], dict(frame=dict(duration=0, redraw=False), mode='immediate')])
+            ])],
+            sliders=[dict(steps=[
+                dict(method='animate', label=str(i),
+                     args=[[str(i)], dict(frame=dict(duration=0, redraw=True), mode='immediate')])
+                for i in range(len(frames))
+            ])]
+        )
+
+    def show(self):
+        self.fig.show()
+
+if __name__ == "__main__":
+    from physics.blackhole import BlackHole
+    from physics.simulation import OrbitSimulation
+
+    # Scene units: GM and rs chosen so orbits fit the viewer's [-10, 10] box
+    rng = np.random.default_rng(0)
+    radius = rng.uniform(3, 9, 2000)
+    angle = rng.uniform(0, 2*np.pi, 2000)
+    positions = np.column_stack([radius * np.cos(angle), rng.normal(0, 0.3, 2000),
+                                 radius * np.sin(angle)])
+    simulation = OrbitSimulation(BlackHole(mass=1e31), positions,
+                                 gravitational_parameter=50.0, schwarzschild_radius=0.5)
+    store = simulation.run(steps=400, dt=0.01, record_every=4)
+    OrbitAnimation(store).show()
@@ -1,7 +1,21 @@
 # Initialize physics package
-from .blackhole import BlackHole
-from .objects import CelestialObject
-from .raytracing import trace_ray, prepare_objects  # Removed Ray import
+# Submodules are imported on first use, so e.g. the Plotly viewer never loads numba or scipy
+import importlib
 
+_exports = {
+    'BlackHole': '.blackhole',
+    'CelestialObject': '.objects',
+    'Scene': '.scene',
+    'AccretionDisk': '.disk',
+    'trace_ray': '.raytracing',
+    'prepare_objects': '.raytracing',
+    'render_tile': '.raytracing',
+    'load_catalog': '.catalog'
+}
 
-__all__ = ['BlackHole', 'CelestialObject', 'trace_ray', 'prepare_objects']  # Removed Ray
\ No newline at end of file
+__all__ = list(_exports)
+
+def __getattr__(name):
+    if name in _exports:
+        return getattr(importlib.import_module(_exports[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,5 +1,4 @@
 import numpy as np
-from scipy.integrate import solve_ivp
 
 class BlackHole:
     def __init__(self, mass, position=[0, 0, 0]):
@@ -24,8 +23,16 @@ class BlackHole:
         
         return [dr, dphi, d2r, d2phi]
     
-    def bend_light(self, ray_origin, ray_direction, steps=100):
-        """Calculate light bending due to gravity by solving geodesic equations"""
+    def bend_light(self, ray_origin, ray_direction, steps=100, return_captured=False,
+                   rtol=1e-3, atol=1e-6):
+        """Calculate light bending due to gravity by solving geodesic equations
+        
+        rtol and atol go to solve_ivp; the defaults are its own and drift by
+        degrees on rays grazing the photon sphere. With return_captured=True,
+        also returns whether the ray ended inside the event horizon.
+        """
+        from scipy.integrate import solve_ivp
+        
         # Convert to polar coordinates relative to black hole
         rel_pos = ray_origin - self.position
         r = np.linalg.norm(rel_pos)
@@ -39,7 +46,7 @@ class BlackHole:
         # Solve geodesic equation
         sol = solve_ivp(self.geodesic_equation, [0, 10], 
                        [r, phi, dr, dphi], 
-                       t_eval=np.linspace(0, 10, steps))
+                       t_eval=np.linspace(0, 10, steps), rtol=rtol, atol=atol)
         
         # Get final direction
         final_r = sol.y[0, -1]
@@ -50,4 +57,48 @@ class BlackHole:
             0  # Simplified 2D version
         ])
         
-        return final_dir
\ No newline at end of file
+        if return_captured:
+            return final_dir, final_r <= self.schwarzschild_radius
+        return final_dir
+    
+    def bend_light_batch(self, ray_origins, ray_directions, t_max=10, steps=1000,
+                         escape_radius=None):
+        """Integrate N light rays in parallel with a fixed-step RK4 scheme
+        
+        Uses the same planar geodesic model as bend_light. A ray stops once it
+        crosses the event horizon or moves beyond escape_radius, which
+        defaults to physics.geodesics.ESCAPE_RADIUS Schwarzschild radii;
+        escaped rays then coast in a straight line to t_max. Pass np.inf to
+        integrate every ray to the end. Returns the (N, 3) final directions
+        and a boolean capture flag per ray.
+        """
+        from physics.geodesics import ESCAPE_RADIUS, integrate_rays
+        
+        origins = np.atleast_2d(np.asarray(ray_origins, dtype=np.float64))
+        directions = np.atleast_2d(np.asarray(ray_directions, dtype=np.float64))
+        rs = self.schwarzschild_radius
+        if escape_radius is None:
+            escape_radius = ESCAPE_RADIUS * rs
+        
+        # Convert to polar coordinates relative to black hole
+        rel_pos = origins - self.position
+        r = np.linalg.norm(rel_pos, axis=1)
+        phi = np.arctan2(rel_pos[:, 1], rel_pos[:, 0])
+        
+        # Convert directions to polar components
+        ray_dirs = directions / np.linalg.norm(directions, axis=1)[:, None]
+        dr = np.einsum('ij,ij->i', ray_dirs, rel_pos) / r
+        dphi = (-ray_dirs[:, 0] * np.sin(phi) + ray_dirs[:, 1] * np.cos(phi)) / r
+        
+        final_phi = np.empty(len(r))
+        captured = np.zeros(len(r), dtype=np.bool_)
+        integrate_rays(r, phi, dr, dphi, rs, float(t_max), int(steps), float(escape_radius),
+                       final_phi, captured)
+        
+        final_dirs = np.stack([
+            np.cos(final_phi),
+            np.sin(final_phi),
+            np.zeros_like(final_phi)  # Simplified 2D version
+        ], axis=1)
+        
+        return final_dirs, captured
\ No newline at end of file
@@ -0,0 +1,192 @@
+import numpy as np
+from numba import njit
+from physics.counters import OBJECTS_TESTED
+
+# Flattened BVH node; children always come after their parent
+node_dtype = np.dtype([
+    ('bbox_min', np.float64, 3),
+    ('bbox_max', np.float64, 3),
+    ('left', np.int64),    # -1 for leaves
+    ('right', np.int64),
+    ('start', np.int64),   # Leaf range into the index array
+    ('count', np.int64)
+])
+
+class BVH:
+    def __init__(self, objects_array, leaf_size=4):
+        """Bounding volume hierarchy over the spheres of an object_dtype array"""
+        self.leaf_size = leaf_size
+        self.build(objects_array)
+
+    def build(self, objects_array):
+        """Rebuild the tree from scratch, e.g. after objects were added or removed"""
+        self.objects_array = objects_array
+        self.nodes = np.zeros(max(2 * len(objects_array) - 1, 0), dtype=node_dtype)
+        self.indices = np.arange(len(objects_array), dtype=np.int64)
+        node_count = _build_bvh(objects_array, self.leaf_size, self.nodes, self.indices)
+        self.nodes = self.nodes[:node_count]
+
+    def refit(self, objects_array=None):
+        """Update node bounds in place after objects moved, keeping the topology"""
+        if objects_array is not None:
+            self.objects_array = objects_array
+        _refit_bvh(self.objects_array, self.nodes, self.indices)
+
+    @property
+    def arrays(self):
+        """(nodes, indices) tuple as expected by trace_ray"""
+        return self.nodes, self.indices
+
+@njit(cache=True)
+def _leaf_bounds(objects_array, indices, start, count, node):
+    for k in range(3):
+        node['bbox_min'][k] = np.inf
+        node['bbox_max'][k] = -np.inf
+    for j in range(start, start + count):
+        obj = objects_array[indices[j]]
+        for k in range(3):
+            node['bbox_min'][k] = min(node['bbox_min'][k], obj['position'][k] - obj['radius'])
+            node['bbox_max'][k] = max(node['bbox_max'][k], obj['position'][k] + obj['radius'])
+
+@njit(cache=True)
+def _build_bvh(objects_array, leaf_size, nodes, indices):
+    """Median-split build into preallocated nodes; returns the node count"""
+    n = len(objects_array)
+    if n == 0:
+        return 0
+
+    centers = np.empty((n, 3))
+    for i in range(n):
+        centers[i] = objects_array[i]['position']
+
+    node_count = 1
+    stack = [(0, 0, n)]
+    while len(stack) > 0:
+        node_idx, start, end = stack.pop()
+        node = nodes[node_idx]
+        node['start'] = start
+        node['count'] = end - start
+        _leaf_bounds(objects_array, indices, start, end - start, node)
+
+        if end - start <= leaf_size:
+            node['left'] = -1
+            node['right'] = -1
+            continue
+
+        # Split at the median centroid along the widest axis
+        lo = np.full(3, np.inf)
+        hi = np.full(3, -np.inf)
+        for j in range(start, end):
+            for k in range(3):
+                lo[k] = min(lo[k], centers[indices[j], k])
+                hi[k] = max(hi[k], centers[indices[j], k])
+        axis = np.argmax(hi - lo)
+
+        segment = indices[start:end].copy()
+        order = np.argsort(centers[segment, axis])
+        indices[start:end] = segment[order]
+        mid = (start + end) // 2
+
+        node['left'] = node_count
+        node['right'] = node_count + 1
+        stack.append((node_count, start, mid))
+        stack.append((node_count + 1, mid, end))
+        node_count += 2
+
+    return node_count
+
+@njit(cache=True)
+def _refit_bvh(objects_array, nodes, indices):
+    for node_idx in range(len(nodes) - 1, -1, -1):
+        node = nodes[node_idx]
+        if node['left'] == -1:
+            _leaf_bounds(objects_array, indices, node['start'], node['count'], node)
+        else:
+            left = nodes[node['left']]
+            right = nodes[node['right']]
+            for k in range(3):
+                node['bbox_min'][k] = min(left['bbox_min'][k], right['bbox_min'][k])
+                node['bbox_max'][k] = max(left['bbox_max'][k], right['bbox_max'][k])
+
+@njit(cache=True)
+def sphere_hit(ray_origin, ray_dir, a, obj):
+    """Nearest non-negative distance to the sphere obj, or inf; a = |ray_dir|^2
+    
+    Written in scalars so the per-object loops allocate nothing. Uses the
+    half-b form of the quadratic.
+    """
+    ox = ray_origin[0] - obj['position'][0]
+    oy = ray_origin[1] - obj['position'][1]
+    oz = ray_origin[2] - obj['position'][2]
+    half_b = ox * ray_dir[0] + oy * ray_dir[1] + oz * ray_dir[2]
+    c = ox * ox + oy * oy + oz * oz - obj['radius'] * obj['radius']
+    discriminant = half_b * half_b - a * c
+    if discriminant < 0:
+        return np.inf
+    
+    root = np.sqrt(discriminant)
+    t = (-half_b - root) / a
+    if t < 0:
+        t = (-half_b + root) / a
+        if t < 0:
+            return np.inf
+    return t
+
+@njit(cache=True)
+def _box_entry(ray_origin, inv_dir, node):
+    """Entry distance of the ray into the node's box, or inf on a miss"""
+    t_near = -np.inf
+    t_far = np.inf
+    for k in range(3):
+        t0 = (node['bbox_min'][k] - ray_origin[k]) * inv_dir[k]
+        t1 = (node['bbox_max'][k] - ray_origin[k]) * inv_dir[k]
+        if t0 > t1:
+            t0, t1 = t1, t0
+        t_near = max(t_near, t0)
+        t_far = min(t_far, t1)
+    if t_near > t_far or t_far < 0:
+        return np.inf
+    return max(t_near, 0.0)
+
+@njit(cache=True)
+def bvh_closest_hit(ray_origin, ray_dir, objects_array, nodes, indices, counters=None):
+    """BVH-accelerated equivalent of closest_hit"""
+    closest_t = np.inf
+    closest_obj_idx = -1
+    if len(nodes) == 0:
+        return closest_t, closest_obj_idx
+
+    inv_dir = np.empty(3)
+    for k in range(3):
+        inv_dir[k] = 1.0 / ray_dir[k] if ray_dir[k] != 0 else np.copysign(1e300, ray_dir[k])
+    a = ray_dir[0] * ray_dir[0] + ray_dir[1] * ray_dir[1] + ray_dir[2] * ray_dir[2]
+
+    stack = np.empty(128, dtype=np.int64)
+    stack[0] = 0
+    top = 1
+    while top > 0:
+        top -= 1
+        node = nodes[stack[top]]
+        if _box_entry(ray_origin, inv_dir, node) >= closest_t:
+            continue
+
+        if node['left'] == -1:
+            if counters is not None:
+                counters[OBJECTS_TESTED] += node['count']
+            for j in range(node['start'], node['start'] + node['count']):
+                i = indices[j]
+                t = sphere_hit(ray_origin, ray_dir, a, objects_array[i])
+                if t < closest_t or (t == closest_t and i < closest_obj_idx):
+                    closest_t = t
+                    closest_obj_idx = i
+            continue
+
+        # Visit the nearer child first
+        left, right = node['left'], node['right']
+        if _box_entry(ray_origin, inv_dir, nodes[left]) < _box_entry(ray_origin, inv_dir, nodes[right]):
+            left, right = right, left
+        stack[top] = left
+        stack[top + 1] = right
+        top += 2
+
+    return closest_t, closest_obj_idx
@@ -0,0 +1,195 @@
+"""Chunked ingestion of object catalogs into memory-mapped object_dtype arrays
+
+Run with: python -m physics.catalog catalog.csv [--out objects.npy]
+          [--chunk-rows 500000] [--downsample 1000 10000 100000]
+
+CSV is read with pandas, Parquet with pyarrow (optional, imported only for
+.parquet) and NPY through a memory map, chunk_rows rows at a time, so memory
+stays bounded however large the catalog is; for Parquet the bound is the
+file's row-group size. Each chunk is converted column-wise into the tracer's record
+layout and appended to disk; later runs open the resulting .npy instantly.
+"""
+import argparse
+import os
+import shutil
+import sys
+import time
+import numpy as np
+from physics.objects import object_dtype
+from physics.storage import atomic_write, atomic_save
+
+# Catalog columns for each record field; missing optional columns get the default
+POSITION_COLUMNS = ('x', 'y', 'z')
+COLOR_COLUMNS = ('r', 'g', 'b')
+DEFAULTS = {'radius': 1.0, 'r': 1.0, 'g': 1.0, 'b': 1.0, 'emission': 0.0}
+
+# Column order assumed for plain 2-D NPY arrays
+NPY_COLUMNS = POSITION_COLUMNS + ('radius',) + COLOR_COLUMNS + ('emission',)
+
+DOWNSAMPLE_SIZES = (1_000, 10_000, 100_000)
+
+def peak_rss():
+    """Peak resident set size of this process in bytes, or None where unsupported"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024  # Linux reports KiB
+
+def iter_chunks(source, chunk_rows=500_000):
+    """Yield column mappings (DataFrame or dict of arrays) of at most chunk_rows rows"""
+    extension = os.path.splitext(source)[1].lower()
+    if extension == '.csv':
+        import pandas as pd
+
+        yield from pd.read_csv(source, chunksize=chunk_rows)
+    elif extension in ('.parquet', '.pq'):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    elif extension == '.npy':
+        data = np.load(source, mmap_mode='r')
+        for start in range(0, len(data), chunk_rows):
+            chunk = data[start:start + chunk_rows]
+            if chunk.dtype.names is None:
+                yield {name: chunk[:, k] for k, name in enumerate(NPY_COLUMNS[:chunk.shape[1]])}
+            else:
+                yield {name: chunk[name] for name in chunk.dtype.names}
+    else:
+        raise ValueError(f"unsupported catalog format {extension!r} (expected .csv, .parquet or .npy)")
+
+def to_records(chunk, dtype=object_dtype):
+    """Pack one chunk of catalog columns into object records without per-row Python"""
+    if isinstance(chunk, dict) and 'position' in chunk:
+        columns = {}  # Already in the record layout, e.g. a saved object array
+        for k, name in enumerate(POSITION_COLUMNS):
+            columns[name] = chunk['position'][:, k]
+        for k, name in enumerate(COLOR_COLUMNS):
+            columns[name] = chunk['color'][:, k]
+        columns['radius'] = chunk['radius']
+        columns['emission'] = chunk['emission']
+        chunk = columns
+
+    missing = [name for name in POSITION_COLUMNS if name not in chunk]
+    if missing:
+        raise ValueError(f"catalog is missing position columns {missing}")
+    rows = len(chunk['x'])
+    records = np.empty(rows, dtype=dtype)
+    for field, names in (('position', POSITION_COLUMNS), ('color', COLOR_COLUMNS)):
+        for k, name in enumerate(names):
+            records[field][:, k] = np.asarray(chunk[name]) if name in chunk else DEFAULTS[name]
+    for field in ('radius', 'emission'):
+        records[field] = np.asarray(chunk[field]) if field in chunk else DEFAULTS[field]
+    return records
+
+def default_output(source):
+    return f'{os.path.splitext(source)[0]}.objects.npy'
+
+def downsampled_path(path, size):
+    return f'{os.path.splitext(path)[0]}.{size}.npy'
+
+def ingest_catalog(source, out=None, chunk_rows=500_000, dtype=object_dtype,
+                   downsample=DOWNSAMPLE_SIZES):
+    """Convert a catalog into an object_dtype .npy and its downsampled variants
+
+    Records are appended to a raw scratch file chunk by chunk, since CSV row
+    counts are not known up front, then copied behind an .npy header. Both
+    files are written next to out and the result appears atomically.
+    Returns a report with row count, timings, peak RSS and output paths.
+    Peak RSS is for the whole process; the final figure also counts catalog
+    pages touched through the memory map while downsampling.
+    """
+    out = default_output(source) if out is None else out
+    start = time.perf_counter()
+    raw_path = f'{out}.{os.getpid()}.raw'
+    rows = 0
+    try:
+        with open(raw_path, 'wb') as raw:
+            for chunk in iter_chunks(source, chunk_rows):
+                records = to_records(chunk, dtype)
+                raw.write(records.tobytes())
+                rows += len(records)
+
+        with atomic_write(out) as f, open(raw_path, 'rb') as raw:
+            np.lib.format.write_array_header_2_0(f, {
+                'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)),
+                'fortran_order': False,
+                'shape': (rows,)
+            })
+            shutil.copyfileobj(raw, f, 16 * 2**20)
+    finally:
+        if os.path.exists(raw_path):
+            os.remove(raw_path)
+    ingest_seconds = time.perf_counter() - start
+    ingest_rss = peak_rss()
+
+    objects_array = open_catalog(out)
+    variants = {size: write_downsampled(objects_array, size, downsampled_path(out, size))
+                for size in downsample if size < rows}
+
+    return {
+        'source': source,
+        'path': out,
+        'rows': rows,
+        'bytes': os.path.getsize(out),
+        'ingest_seconds': ingest_seconds,
+        'total_seconds': time.perf_counter() - start,
+        'rows_per_second': rows / ingest_seconds if ingest_seconds > 0 else float('inf'),
+        'ingest_peak_rss_bytes': ingest_rss,
+        'peak_rss_bytes': peak_rss(),
+        'downsampled': variants
+    }
+
+def open_catalog(path):
+    """Read-only memory map of an ingested catalog, ready for the tracer"""
+    return np.load(path, mmap_mode='r')
+
+def downsample(objects_array, size, seed=0):
+    """Uniform random subset of size records, kept in catalog order"""
+    if size >= len(objects_array):
+        return np.array(objects_array)
+    rng = np.random.default_rng(seed)
+    indices = np.sort(rng.choice(len(objects_array), size, replace=False))
+    return objects_array[indices]  # Sorted indices read the memory map front to back
+
+def write_downsampled(objects_array, size, path, seed=0):
+    atomic_save(path, downsample(objects_array, size, seed))
+    return path
+
+def load_catalog(source, out=None, chunk_rows=500_000, dtype=object_dtype,
+                 downsample=DOWNSAMPLE_SIZES):
+    """Memory-mapped object array for a catalog, ingesting it only when out is stale"""
+    out = default_output(source) if out is None else out
+    if not os.path.exists(out) or os.path.getmtime(out) < os.path.getmtime(source):
+        ingest_catalog(source, out, chunk_rows, dtype, downsample)
+    objects_array = open_catalog(out)
+    if objects_array.dtype != dtype:
+        raise ValueError(f"{out} holds {objects_array.dtype}, not {np.dtype(dtype)}; re-ingest it")
+    return objects_array
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('source', help='.csv, .parquet or .npy catalog')
+    parser.add_argument('--out', help='output .npy (default: <source>.objects.npy)')
+    parser.add_argument('--chunk-rows', type=int, default=500_000)
+    parser.add_argument('--downsample', type=int, nargs='*', default=list(DOWNSAMPLE_SIZES),
+                        help='sizes of the random subsets written for the Plotly viewers')
+    args = parser.parse_args(argv)
+
+    report = ingest_catalog(args.source, args.out, args.chunk_rows, downsample=args.downsample)
+    ingest_rss, rss = report['ingest_peak_rss_bytes'], report['peak_rss_bytes']
+    print(f"{report['rows']:,} objects -> {report['path']} ({report['bytes'] / 2**20:.1f} MiB)")
+    print(f"ingest {report['ingest_seconds']:.2f}s ({report['rows_per_second']:,.0f} rows/s), "
+          f"total {report['total_seconds']:.2f}s")
+    if rss is None:
+        print("peak RSS unavailable on this platform")
+    else:
+        print(f"peak RSS {ingest_rss / 2**20:.1f} MiB after ingest, {rss / 2**20:.1f} MiB overall")
+    for size, path in report['downsampled'].items():
+        print(f"  {size:>9,} -> {path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,14 @@
+# Column layout of the per-row counter arrays the kernels fill when instrumented
+COUNTER_NAMES = (
+    'primary_rays',
+    'bounces',
+    'hits',
+    'sky_misses',
+    'captured',
+    'lensed',
+    'objects_tested',
+    'disk_hits'
+)
+
+(PRIMARY_RAYS, BOUNCES, HITS, SKY_MISSES, CAPTURED, LENSED, OBJECTS_TESTED,
+ DISK_HITS) = range(len(COUNTER_NAMES))
\ No newline at end of file
@@ -0,0 +1,114 @@
+import os
+from functools import lru_cache
+import numpy as np
+from numba import njit
+from physics.storage import load_or_build
+
+DISK_TEXTURE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 'assets', 'textures', 'disk_texture.npy')
+
+# Texture rows cover r / inner_radius on a log grid from 1 to this ratio
+DISK_MAX_RATIO = 100.0
+
+# Temperature at the emissivity peak, before Doppler/gravitational shift
+DISK_PEAK_TEMPERATURE = 9000.0
+
+def blackbody_rgb(temperature):
+    """Approximate sRGB chromaticity of a blackbody, brightest channel scaled to 1"""
+    t = np.clip(np.asarray(temperature, dtype=np.float64), 1000.0, 40000.0) / 100.0
+    r = np.where(t <= 66, 255.0, 329.698727446 * (t - 60)**-0.1332047592)
+    g = np.where(t <= 66, 99.4708025861 * np.log(t) - 161.1195681661,
+                 288.1221695283 * (t - 60)**-0.0755148492)
+    b = np.where(t >= 66, 255.0,
+                 np.where(t <= 19, 0.0, 138.5177312231 * np.log(np.maximum(t - 10, 1)) - 305.0447927307))
+    rgb = np.clip(np.stack([r, g, b], axis=-1), 0, 255)
+    return rgb / rgb.max(axis=-1, keepdims=True)
+
+def compute_disk_texture(radial=256, angular=64, exposure=2.0):
+    """Observed disk color over (r / inner_radius, cos of the view-velocity angle)
+
+    The inner edge is taken as the ISCO (3 rs), so the texture does not depend
+    on the black hole mass. Emission follows the thin-disk flux
+    F ~ x^-3 (1 - x^-1/2); the orbital speed and gravitational redshift give
+    g = sqrt(1 - rs/r) / (gamma (1 - beta mu)), which scales the temperature
+    by g and the brightness by g^4. Returns a (radial, angular, 3) float32 array.
+    """
+    x = np.exp(np.linspace(0, np.log(DISK_MAX_RATIO), radial))[:, None]
+    mu = np.linspace(-1, 1, angular)[None, :]
+
+    flux = x**-3 * (1 - x**-0.5)
+    peak = (49 / 36)**-3 * (1 - 6 / 7)
+    r_over_rs = 3 * x
+    beta = np.sqrt(1 / (2 * (r_over_rs - 1)))
+    gamma = 1 / np.sqrt(1 - beta**2)
+    g = np.sqrt(1 - 1 / r_over_rs) / (gamma * (1 - beta * mu))
+
+    temperature = DISK_PEAK_TEMPERATURE * (flux / peak)**0.25 * g
+    brightness = 1 - np.exp(-exposure * g**4 * flux / peak)
+    return (blackbody_rgb(temperature) * brightness[..., None]).astype(np.float32)
+
+@lru_cache(maxsize=None)
+def load_disk_texture(path=DISK_TEXTURE_PATH):
+    """Memory-map the disk texture, building and caching it on first use"""
+    return load_or_build(path, compute_disk_texture)
+
+class AccretionDisk:
+    def __init__(self, inner_radius, outer_radius, tilt=0.0):
+        """Thin disk around the black hole, in the xz-plane tilted by `tilt` degrees about x"""
+        self.inner_radius = inner_radius
+        self.outer_radius = outer_radius
+        self.tilt = tilt
+
+    @property
+    def normal(self):
+        angle = np.radians(self.tilt)
+        return np.array([0.0, np.cos(angle), np.sin(angle)])
+
+    @property
+    def geometry(self):
+        """(nx, ny, nz, inner radius, outer radius) as read by disk_hit"""
+        return np.concatenate([self.normal, [self.inner_radius, self.outer_radius]])
+
+    @property
+    def arrays(self):
+        """(geometry, texture) tuple as expected by trace_ray"""
+        return self.geometry, load_disk_texture()
+
+@njit(cache=True)
+def disk_hit(ray_origin, ray_dir, center, geometry, t_max):
+    """Distance to the disk along the ray if it lands within [inner, outer] before t_max, else inf"""
+    normal = geometry[:3]
+    denom = np.dot(ray_dir, normal)
+    if abs(denom) < 1e-12:
+        return np.inf
+    t = np.dot(center - ray_origin, normal) / denom
+    if t <= 0 or t >= t_max:
+        return np.inf
+    offset = ray_origin + t * ray_dir - center
+    r = np.sqrt(np.dot(offset, offset))
+    if r < geometry[3] or r > geometry[4]:
+        return np.inf
+    return t
+
+@njit(cache=True)
+def shade_disk(texture, geometry, center, hit_point, ray_dir):
+    """Bilinear texture fetch for a disk hit seen along ray_dir"""
+    normal = geometry[:3]
+    offset = hit_point - center
+    r = np.sqrt(np.dot(offset, offset))
+    velocity = np.cross(normal, offset) / r  # Prograde about the normal
+    mu = -np.dot(velocity, ray_dir)
+
+    n_r, n_mu = texture.shape[0], texture.shape[1]
+    pos_r = min(np.log(r / geometry[3]) / np.log(DISK_MAX_RATIO), 1.0) * (n_r - 1)
+    pos_mu = min(max(0.5 * (mu + 1), 0.0), 1.0) * (n_mu - 1)
+    i = min(int(pos_r), n_r - 2)
+    j = min(int(pos_mu), n_mu - 2)
+    wr = pos_r - i
+    wm = pos_mu - j
+
+    color = np.empty(3)
+    for c in range(3):
+        color[c] = ((texture[i, j, c] * (1 - wm) + texture[i, j + 1, c] * wm) * (1 - wr)
+                    + (texture[i + 1, j, c] * (1 - wm) + texture[i + 1, j + 1, c] * wm) * wr)
+    return color
\ No newline at end of file
@@ -1,5 +1,13 @@
 import numpy as np
 
+# Numba-compatible object representation
+object_dtype = np.dtype([
+    ('position', np.float64, 3),
+    ('radius', np.float64),
+    ('color', np.float64, 3),
+    ('emission', np.float64)
+])
+
 class CelestialObject:
     def __init__(self, position, radius, color, emission=0.0):
         self.position = np.array(position, dtype=np.float64)
@@ -1,6 +1,12 @@
 import numpy as np
-from numba import njit, types
+from numba import njit, prange, types
 from numba.typed import List
+from physics.objects import object_dtype
+from physics.lensing import sample_deflection
+from physics.bvh import bvh_closest_hit, sphere_hit
+from physics.disk import disk_hit, shade_disk
+from physics.counters import (PRIMARY_RAYS, BOUNCES, HITS, SKY_MISSES, CAPTURED, LENSED,
+                              OBJECTS_TESTED, DISK_HITS)
 
 class Ray:
     def __init__(self, origin, direction):
@@ -9,59 +15,116 @@ class Ray:
         self.direction = np.array(direction, dtype=np.float64)
         self.direction = self.direction / np.linalg.norm(self.direction)  # Normalize
 
-# Numba-compatible object representation
-object_dtype = np.dtype([
-    ('position', np.float64, 3),
-    ('radius', np.float64),
-    ('color', np.float64, 3),
-    ('emission', np.float64)
-])
-
-@njit
-def trace_ray(ray_origin, ray_dir, objects_array, black_hole_pos, black_hole_mass, max_bounces=3):
-    """Numba-compatible ray tracing function"""
+
+@njit(cache=True)
+def closest_hit(ray_origin, ray_dir, objects_array):
+    """Distance and index of the nearest sphere hit, or (inf, -1)"""
+    closest_t = np.inf
+    closest_obj_idx = -1
+    a = ray_dir[0] * ray_dir[0] + ray_dir[1] * ray_dir[1] + ray_dir[2] * ray_dir[2]
+    
+    for i in range(len(objects_array)):
+        t = sphere_hit(ray_origin, ray_dir, a, objects_array[i])
+        if t < closest_t:
+            closest_t = t
+            closest_obj_idx = i
+    
+    return closest_t, closest_obj_idx
+
+@njit(cache=True)
+def find_hit(ray_origin, ray_dir, objects_array, bvh=None, counters=None):
+    """Closest hit through the (nodes, indices) BVH if given, else brute force"""
+    if bvh is None:
+        if counters is not None:
+            counters[OBJECTS_TESTED] += len(objects_array)
+        return closest_hit(ray_origin, ray_dir, objects_array)
+    return bvh_closest_hit(ray_origin, ray_dir, objects_array, bvh[0], bvh[1], counters)
+
+@njit(cache=True)
+def trace_ray(ray_origin, ray_dir, objects_array, black_hole_pos, black_hole_mass, max_bounces=3,
+              deflection_lut=None, bvh=None, disk=None, counters=None):
+    """Numba-compatible ray tracing function
+    
+    With a deflection_lut (see physics.lensing), every ray segment passing
+    the black hole is bent by the tabulated Schwarzschild deflection angle
+    or absorbed. Without one, the legacy blend after each bounce is used.
+    Passing bvh=(nodes, indices) from physics.bvh.BVH replaces the linear
+    intersection scan with a tree traversal. disk=(geometry, texture) from
+    physics.disk.AccretionDisk adds an opaque emitting disk centered on the
+    black hole: one plane test per segment and one texture fetch per hit.
+    A counters array (see
+    physics.counters) is incremented in place; leaving it None compiles the
+    counting out entirely.
+    """
     color = np.zeros(3)
     current_origin = ray_origin.copy()
     current_dir = ray_dir.copy()
     attenuation = 1.0
     rs = 2 * 6.67430e-11 * black_hole_mass / (299792458.0**2) if black_hole_mass > 0 else 0
+    if counters is not None:
+        counters[PRIMARY_RAYS] += 1
     
     for _ in range(max_bounces):
+        if counters is not None:
+            counters[BOUNCES] += 1
+        
         # Find closest intersection
-        closest_t = np.inf
-        closest_obj_idx = -1
-        closest_normal = np.zeros(3)
+        closest_t, closest_obj_idx = find_hit(current_origin, current_dir, objects_array, bvh, counters)
         
-        for i in range(len(objects_array)):
-            obj = objects_array[i]
-            oc = current_origin - obj['position']
-            a = np.dot(current_dir, current_dir)
-            b = 2.0 * np.dot(oc, current_dir)
-            c = np.dot(oc, oc) - obj['radius']**2
-            discriminant = b**2 - 4*a*c
-            
-            if discriminant < 0:
-                continue
-                
-            t = (-b - np.sqrt(discriminant)) / (2.0 * a)
-            if t < 0:
-                t = (-b + np.sqrt(discriminant)) / (2.0 * a)
-                if t < 0:
-                    continue
-            
-            if t < closest_t:
-                closest_t = t
-                closest_obj_idx = i
-                closest_normal = (current_origin + t*current_dir - obj['position']) / obj['radius']
+        # Gravitational lensing from the deflection table
+        if deflection_lut is not None and rs > 0:
+            to_bh = black_hole_pos - current_origin
+            t_ca = np.dot(to_bh, current_dir)
+            if t_ca > 0 and t_ca < closest_t:
+                # The disk can block the segment before it reaches closest approach
+                if disk is not None:
+                    t_disk = disk_hit(current_origin, current_dir, black_hole_pos, disk[0], t_ca)
+                    if t_disk < np.inf:
+                        if counters is not None:
+                            counters[DISK_HITS] += 1
+                        color += attenuation * shade_disk(disk[1], disk[0], black_hole_pos,
+                                                          current_origin + t_disk * current_dir,
+                                                          current_dir)
+                        break
+                offset = to_bh - t_ca * current_dir
+                b = np.sqrt(np.dot(offset, offset))
+                alpha, captured = sample_deflection(deflection_lut, b / rs)
+                if captured:
+                    if counters is not None:
+                        counters[CAPTURED] += 1
+                    break  # Swallowed by the black hole
+                if counters is not None:
+                    counters[LENSED] += 1
+                if b > 0:
+                    current_origin = current_origin + t_ca * current_dir
+                    current_dir = np.cos(alpha) * current_dir + np.sin(alpha) * offset / b
+                    current_dir = current_dir / np.sqrt(np.dot(current_dir, current_dir))
+                    closest_t, closest_obj_idx = find_hit(current_origin, current_dir, objects_array,
+                                                          bvh, counters)
+        
+        if disk is not None:
+            t_disk = disk_hit(current_origin, current_dir, black_hole_pos, disk[0], closest_t)
+            if t_disk < np.inf:
+                if counters is not None:
+                    counters[DISK_HITS] += 1
+                color += attenuation * shade_disk(disk[1], disk[0], black_hole_pos,
+                                                  current_origin + t_disk * current_dir, current_dir)
+                break
         
         if closest_obj_idx == -1:
             # Sky color
+            if counters is not None:
+                counters[SKY_MISSES] += 1
             color += attenuation * np.array([0.1, 0.1, 0.3])
             break
         
+        if counters is not None:
+            counters[HITS] += 1
+        
         # Calculate lighting
         obj = objects_array[closest_obj_idx]
         hit_point = current_origin + closest_t * current_dir
+        closest_normal = (hit_point - obj['position']) / obj['radius']
         
         # Emission
         color += attenuation * obj['color'] * obj['emission']
@@ -77,8 +140,8 @@ def trace_ray(ray_origin, ray_dir, objects_array, black_hole_pos, black_hole_mas
         current_dir = current_dir - 2 * np.dot(current_dir, closest_normal) * closest_normal
         attenuation *= 0.5
         
-        # Gravitational lensing
-        if black_hole_mass > 0:
+        # Legacy gravitational lensing
+        if deflection_lut is None and black_hole_mass > 0:
             dir_to_bh = black_hole_pos - current_origin
             distance = np.sqrt(np.dot(dir_to_bh, dir_to_bh))
             influence = min(1.0, rs / distance)
@@ -89,10 +152,145 @@ def trace_ray(ray_origin, ray_dir, objects_array, black_hole_pos, black_hole_mas
 
 def prepare_objects(objects):
     """Convert Python objects to Numba-compatible array"""
+    from physics.scene import Scene
+    if isinstance(objects, Scene):
+        return objects.array  # Already packed, no copy
+    if isinstance(objects, np.ndarray) and objects.dtype == object_dtype:
+        return objects
     objects_array = np.zeros(len(objects), dtype=object_dtype)
     for i, obj in enumerate(objects):
         objects_array[i]['position'] = obj.position
         objects_array[i]['radius'] = obj.radius
         objects_array[i]['color'] = obj.color
         objects_array[i]['emission'] = obj.emission
-    return objects_array
\ No newline at end of file
+    return objects_array
+
+@njit(cache=True)
+def primary_ray(u, v, width, height, forward, right, up, scale):
+    """Unit camera ray through image coordinates (u, v), as in Camera.get_ray"""
+    aspect_ratio = width / height
+    px = (2 * (u + 0.5) / width - 1) * aspect_ratio * scale
+    py = (1 - 2 * (v + 0.5) / height) * scale
+
+    ray_dir = forward + px * right + py * up
+    return ray_dir / np.sqrt(np.dot(ray_dir, ray_dir))
+
+@njit(cache=True)
+def sample_pixel(x, y, width, height, cam_pos, forward, right, up, scale, samples,
+                 objects_array, black_hole_pos, black_hole_mass, max_bounces,
+                 deflection_lut, bvh, disk=None, counters=None):
+    """Sum of the colors of `samples` jittered rays through pixel (x, y)"""
+    color = np.zeros(3)
+    for _ in range(samples):
+        u = x + np.random.random()
+        v = y + np.random.random()
+        ray_dir = primary_ray(u, v, width, height, forward, right, up, scale)
+        color += trace_ray(cam_pos, ray_dir, objects_array,
+                           black_hole_pos, black_hole_mass, max_bounces,
+                           deflection_lut, bvh, disk, counters)
+    return color
+
+@njit(parallel=True, nogil=True, cache=True)
+def render_tile(image, x0, y0, x1, y1, cam_pos, forward, right, up, fov,
+                samples_per_pixel, objects_array, black_hole_pos, black_hole_mass,
+                max_bounces=3, deflection_lut=None, bvh=None, disk=None, counters=None):
+    """Render pixels [x0, x1) x [y0, y1) of image in parallel over rows
+    
+    counters, if given, is an (image height, len(COUNTER_NAMES)) array; each
+    row is only touched by the thread rendering it, so no atomics are needed.
+    """
+    height, width = image.shape[0], image.shape[1]
+    scale = np.tan(np.radians(fov * 0.5))
+
+    for y in prange(y0, y1):
+        for x in range(x0, x1):
+            if counters is None:
+                color = sample_pixel(x, y, width, height, cam_pos, forward, right, up, scale,
+                                     samples_per_pixel, objects_array, black_hole_pos,
+                                     black_hole_mass, max_bounces, deflection_lut, bvh, disk)
+            else:
+                color = sample_pixel(x, y, width, height, cam_pos, forward, right, up, scale,
+                                     samples_per_pixel, objects_array, black_hole_pos,
+                                     black_hole_mass, max_bounces, deflection_lut, bvh, disk,
+                                     counters[y])
+
+            # Same float32 clamp-and-truncate as the reference Renderer.render
+            for c in range(3):
+                value = min(max(color[c] / samples_per_pixel, 0.0), 1.0)
+                image[y, x, c] = np.uint8(np.float32(value) * np.float32(255))
+
+@njit(parallel=True, nogil=True, cache=True)
+def accumulate_tile(accum, x0, y0, x1, y1, cam_pos, forward, right, up, fov,
+                    samples_per_pixel, objects_array, black_hole_pos, black_hole_mass,
+                    max_bounces=3, deflection_lut=None, bvh=None, disk=None):
+    """Add the summed color of samples_per_pixel new samples into a float accum buffer"""
+    height, width = accum.shape[0], accum.shape[1]
+    scale = np.tan(np.radians(fov * 0.5))
+
+    for y in prange(y0, y1):
+        for x in range(x0, x1):
+            accum[y, x] += sample_pixel(x, y, width, height, cam_pos, forward, right, up,
+                                        scale, samples_per_pixel, objects_array,
+                                        black_hole_pos, black_hole_mass, max_bounces,
+                                        deflection_lut, bvh, disk)
+
+@njit(cache=True)
+def hash_uniform(seed, pixel, sample):
+    """Counter-based uniform in [0, 1): splitmix64 of (seed, pixel, sample)"""
+    z = (np.uint64(seed) * np.uint64(0x9E3779B97F4A7C15)
+         ^ np.uint64(pixel) * np.uint64(0xBF58476D1CE4E5B9)
+         ^ np.uint64(sample) * np.uint64(0x94D049BB133111EB))
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    z = z ^ (z >> np.uint64(31))
+    return np.float64(z >> np.uint64(11)) * (1.0 / 9007199254740992.0)
+
+@njit(parallel=True, nogil=True, cache=True)
+def render_adaptive(image, spp_map, cam_pos, forward, right, up, fov, strata, max_samples,
+                    threshold, seed, objects_array, black_hole_pos, black_hole_mass,
+                    max_bounces=3, deflection_lut=None, bvh=None, disk=None):
+    """Render with strata x strata stratified samples, then add samples where noisy
+    
+    A pixel keeps sampling in batches of strata**2 until the standard error of
+    its luminance drops to threshold or it reaches max_samples. Jitter comes
+    from hash_uniform, so a given seed always produces the same image.
+    """
+    height, width = image.shape[0], image.shape[1]
+    scale = np.tan(np.radians(fov * 0.5))
+    base = strata * strata
+
+    for y in prange(height):
+        for x in range(width):
+            pixel = y * width + x
+            color = np.zeros(3)
+            mean = 0.0
+            m2 = 0.0
+            n = 0
+            while n < max_samples:
+                batch_end = min(n + base, max_samples)
+                while n < batch_end:
+                    if n < base:
+                        u = x + (n % strata + hash_uniform(seed, pixel, 2 * n)) / strata
+                        v = y + (n // strata + hash_uniform(seed, pixel, 2 * n + 1)) / strata
+                    else:
+                        u = x + hash_uniform(seed, pixel, 2 * n)
+                        v = y + hash_uniform(seed, pixel, 2 * n + 1)
+                    ray_dir = primary_ray(u, v, width, height, forward, right, up, scale)
+                    sample = trace_ray(cam_pos, ray_dir, objects_array, black_hole_pos,
+                                       black_hole_mass, max_bounces, deflection_lut, bvh, disk)
+                    color += sample
+
+                    # Welford update of the luminance variance
+                    n += 1
+                    luminance = 0.2126 * sample[0] + 0.7152 * sample[1] + 0.0722 * sample[2]
+                    delta = luminance - mean
+                    mean += delta / n
+                    m2 += delta * (luminance - mean)
+
+                if n > 1 and np.sqrt(m2 / (n - 1) / n) <= threshold:
+                    break
+
+            spp_map[y, x] = n
+            for c in range(3):
+                value = min(max(color[c] / n, 0.0), 1.0)
+                image[y, x, c] = np.uint8(np.float32(value) * np.float32(255))
@@ -0,0 +1,147 @@
+import numpy as np
+from physics.objects import CelestialObject, object_dtype
+
+class SceneObject(CelestialObject):
+    def __init__(self, scene, handle):
+        """CelestialObject view onto one record of a Scene"""
+        self.scene = scene
+        self.handle = handle
+
+    @property
+    def _record(self):
+        return self.scene.array[self.scene.slot(self.handle)]
+
+    def _read_only(self, field):
+        value = self._record[field].view()
+        value.flags.writeable = False  # Writes must go through the setter
+        return value
+
+    @property
+    def position(self):
+        return self._read_only('position')
+
+    @position.setter
+    def position(self, value):
+        self.scene.update(self.handle, position=value)
+
+    @property
+    def radius(self):
+        return float(self._record['radius'])
+
+    @radius.setter
+    def radius(self, value):
+        self.scene.update(self.handle, radius=value)
+
+    @property
+    def color(self):
+        return self._read_only('color')
+
+    @color.setter
+    def color(self, value):
+        self.scene.update(self.handle, color=value)
+
+    @property
+    def emission(self):
+        return float(self._record['emission'])
+
+    @emission.setter
+    def emission(self, value):
+        self.scene.update(self.handle, emission=value)
+
+class Scene:
+    def __init__(self, objects=(), capacity=16):
+        """Objects stored as one contiguous object_dtype array
+
+        add/remove/update are O(1) (amortized for add). Objects are addressed by
+        stable integer handles; removal swaps the last record into the hole.
+        `version` changes on every edit and `structure_version` only when objects
+        are added or removed, so consumers can tell a refit from a rebuild.
+        """
+        self._data = np.zeros(max(capacity, 1), dtype=object_dtype)
+        self._handles = np.zeros(len(self._data), dtype=np.int64)  # slot -> handle
+        self._slots = {}  # handle -> slot
+        self._count = 0
+        self._next_handle = 0
+        self.version = 0
+        self.structure_version = 0
+        for obj in objects:
+            self.add(obj.position, obj.radius, obj.color, obj.emission)
+
+    @classmethod
+    def from_array(cls, objects_array):
+        """Scene holding a copy of a packed array, e.g. a downsampled catalog"""
+        scene = cls(capacity=len(objects_array))
+        count = len(objects_array)
+        scene._data[:count] = objects_array
+        scene._handles[:count] = np.arange(count)
+        scene._slots = dict(zip(range(count), range(count)))
+        scene._count = count
+        scene._next_handle = count
+        scene._touch(structural=True)
+        return scene
+
+    @property
+    def array(self):
+        """Live view of the packed records, handed to the tracer without copying"""
+        return self._data[:self._count]
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for slot in range(self._count):
+            yield SceneObject(self, int(self._handles[slot]))
+
+    def __getitem__(self, handle):
+        self.slot(handle)
+        return SceneObject(self, handle)
+
+    def slot(self, handle):
+        return self._slots[handle]
+
+    def add(self, position, radius, color, emission=0.0):
+        """Append an object and return its handle"""
+        if self._count == len(self._data):
+            self._data = np.concatenate([self._data, np.zeros(len(self._data), dtype=object_dtype)])
+            self._handles = np.concatenate([self._handles, np.zeros(len(self._handles), dtype=np.int64)])
+
+        slot = self._count
+        record = self._data[slot]
+        record['position'] = position
+        record['radius'] = radius
+        record['color'] = color
+        record['emission'] = emission
+
+        handle = self._next_handle
+        self._next_handle += 1
+        self._handles[slot] = handle
+        self._slots[handle] = slot
+        self._count += 1
+        self._touch(structural=True)
+        return handle
+
+    def add_object(self, obj):
+        return self.add(obj.position, obj.radius, obj.color, obj.emission)
+
+    def remove(self, handle):
+        slot = self._slots.pop(handle)
+        last = self._count - 1
+        if slot != last:
+            self._data[slot] = self._data[last]
+            moved = int(self._handles[last])
+            self._handles[slot] = moved
+            self._slots[moved] = slot
+        self._count -= 1
+        self._touch(structural=True)
+
+    def update(self, handle, **fields):
+        """Overwrite fields (position, radius, color, emission) of one object"""
+        record = self._data[self._slots[handle]]
+        for name, value in fields.items():
+            record[name] = value
+        self._touch(structural=False)
+
+    def _touch(self, structural):
+        self.version += 1
+        if structural:
+            self.structure_version += 1
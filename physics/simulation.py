@@ -0,0 +1,121 @@
+import numpy as np
+from numba import njit, prange
+
+G = 6.67430e-11
+
+class TrajectoryStore:
+    def __init__(self, steps, bodies, path=None, dtype=np.float32):
+        """Preallocated (steps, bodies, 3) position history, optionally memory-mapped"""
+        shape = (steps, bodies, 3)
+        if path is None:
+            self.positions = np.empty(shape, dtype=dtype)
+        else:
+            self.positions = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+        self.count = 0
+
+    @classmethod
+    def open(cls, path):
+        """Reopen a stored trajectory read-only without loading it into memory"""
+        store = cls.__new__(cls)
+        store.positions = np.load(path, mmap_mode='r')
+        store.count = len(store.positions)
+        return store
+
+    def append(self, positions):
+        self.positions[self.count] = positions
+        self.count += 1
+
+    @property
+    def frames(self):
+        return self.positions[:self.count]
+
+    def flush(self):
+        if isinstance(self.positions, np.memmap):
+            self.positions.flush()
+
+@njit(cache=True)
+def _acceleration(position, center, gm, rs, out):
+    d = center - position
+    r = np.sqrt(np.dot(d, d))
+    # Paczynski-Wiita potential -GM/(r - rs) mimics the Schwarzschild ISCO; rs=0 is Newtonian
+    magnitude = gm / ((r - rs)**2 * r)
+    for k in range(3):
+        out[k] = magnitude * d[k]
+
+@njit(parallel=True, cache=True)
+def _verlet_step(positions, velocities, accelerations, captured, center, gm, rs, horizon, dt):
+    """Advance all bodies one velocity-Verlet step in place"""
+    for i in prange(len(positions)):
+        if captured[i]:
+            continue
+        for k in range(3):
+            velocities[i, k] += 0.5 * dt * accelerations[i, k]
+            positions[i, k] += dt * velocities[i, k]
+
+        d = positions[i] - center
+        if np.sqrt(np.dot(d, d)) <= horizon:
+            captured[i] = True
+            continue
+
+        _acceleration(positions[i], center, gm, rs, accelerations[i])
+        for k in range(3):
+            velocities[i, k] += 0.5 * dt * accelerations[i, k]
+
+class OrbitSimulation:
+    def __init__(self, black_hole, positions, velocities=None, gravitational_parameter=None,
+                 schwarzschild_radius=None, relativistic=True):
+        """Bodies orbiting a BlackHole, advanced together in batched steps
+
+        gravitational_parameter (GM) and schwarzschild_radius default to the
+        black hole's SI values; override both to simulate in scene units.
+        Bodies that cross the horizon are flagged in `captured` and frozen.
+        """
+        self.center = np.asarray(black_hole.position, dtype=np.float64)
+        self.gm = G * black_hole.mass if gravitational_parameter is None else gravitational_parameter
+        rs = black_hole.schwarzschild_radius if schwarzschild_radius is None else schwarzschild_radius
+        self.rs = rs if relativistic else 0.0
+        self.horizon = rs
+        self.positions = np.array(positions, dtype=np.float64).reshape(-1, 3)
+        self.velocities = (self.circular_velocities() if velocities is None
+                           else np.array(velocities, dtype=np.float64).reshape(-1, 3))
+        self.captured = np.zeros(len(self.positions), dtype=np.bool_)
+        d = self.center - self.positions
+        r = np.linalg.norm(d, axis=1)
+        self.accelerations = d * (self.gm / ((r - self.rs)**2 * r))[:, None]
+        self.time = 0.0
+
+    @classmethod
+    def from_objects(cls, black_hole, objects, velocities=None, **kwargs):
+        """Start from a list of CelestialObject or a Scene"""
+        positions = np.array([obj.position for obj in objects], dtype=np.float64).reshape(-1, 3)
+        return cls(black_hole, positions, velocities, **kwargs)
+
+    def circular_velocities(self, axis=(0, 1, 0)):
+        """Velocities for circular orbits about `axis` through the black hole"""
+        d = self.positions - self.center
+        r = np.linalg.norm(d, axis=1)
+        tangent = np.cross(np.asarray(axis, dtype=np.float64), d)
+        norm = np.linalg.norm(tangent, axis=1)
+        # Bodies on the axis get an arbitrary perpendicular direction
+        degenerate = norm == 0
+        tangent[degenerate] = np.cross([1.0, 0.0, 0.0], d[degenerate])
+        norm[degenerate] = np.linalg.norm(tangent[degenerate], axis=1)
+        speed = np.sqrt(self.gm * r / (r - self.rs)**2)
+        return tangent / np.maximum(norm, 1e-300)[:, None] * speed[:, None]
+
+    def step(self, dt):
+        _verlet_step(self.positions, self.velocities, self.accelerations, self.captured,
+                     self.center, self.gm, self.rs, self.horizon, dt)
+        self.time += dt
+
+    def run(self, steps, dt, store=None, record_every=1):
+        """Advance `steps` steps and record every record_every-th state into store"""
+        if store is None:
+            store = TrajectoryStore(steps // record_every + 1, len(self.positions))
+        store.append(self.positions)
+        for n in range(1, steps + 1):
+            self.step(dt)
+            if n % record_every == 0 and store.count < len(store.positions):
+                store.append(self.positions)
+        store.flush()
+        return store
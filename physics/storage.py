@@ -0,0 +1,31 @@
+import os
+import threading
+from contextlib import contextmanager
+import numpy as np
+
+@contextmanager
+def atomic_write(path):
+    """Binary file that replaces path only once the with-block completes
+
+    Readers, including other processes, see either the old file or the
+    complete new one, never a partial write.
+    """
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            yield f
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def atomic_save(path, array):
+    """np.save through atomic_write"""
+    with atomic_write(path) as f:
+        np.save(f, array)
+
+def load_or_build(path, build):
+    """Read-only memory map of the array at path, saving build() there first if missing"""
+    if not os.path.exists(path):
+        atomic_save(path, build())
+    return np.load(path, mmap_mode='r')
\ No newline at end of file
@@ -1,15 +1,47 @@
+import time
+from functools import lru_cache
 import numpy as np
 import plotly.graph_objects as go
-from matplotlib import cm
+
+@lru_cache(maxsize=None)
+def unit_sphere(n_u, n_v):
+    """Cached unit-sphere surface grid shared by all sphere traces"""
+    u, v = np.mgrid[0:2*np.pi:complex(n_u), 0:np.pi:complex(n_v)]
+    return np.cos(u)*np.sin(v), np.sin(u)*np.sin(v), np.cos(v)
+
+def lens_positions(points, center, rs):
+    """Pull an (N, 3) array of points toward center, as seen through the lens"""
+    dist = np.linalg.norm(center - points, axis=1)
+    influence = np.minimum(0.95, (rs/dist)**2)[:, None]
+    return points * (1 - influence) + center * influence
+
+def decimate_points(points, budget, weights=None, seed=0):
+    """Keep at most budget points, sampled without replacement in proportion to weights"""
+    if len(points) <= budget:
+        return points
+    rng = np.random.default_rng(seed)
+    if weights is None:
+        keep = rng.choice(len(points), budget, replace=False)
+    else:
+        # Efraimidis-Spirakis weighted reservoir keys; the largest `budget` win
+        keys = np.log(rng.random(len(points))) / weights
+        keep = np.argpartition(keys, -budget)[-budget:]
+    return points[np.sort(keep)]
 
 class BlackHoleVisualizer:
-    def __init__(self, mass=10, position=[0, 0, 0]):
+    def __init__(self, mass=10, position=[0, 0, 0], num_stars=300, star_budget=20000,
+                 stars=None):
         self.fig = go.Figure()
+        self.num_stars = num_stars
+        self.star_budget = star_budget  # Max markers sent to the browser
+        self.stars = stars  # Optional (N, 3) background catalog
         self.mass = mass * 2e30
         self.position = np.array(position)
         self.rs = 2 * 6.67430e-11 * self.mass / (299792458.0**2)
         self.rs *= 1e9  # Scale up for visibility
+        start = time.perf_counter()
         self.setup_visualization()
+        self.build_seconds = time.perf_counter() - start
 
     def setup_visualization(self):
         self.add_event_horizon()
@@ -37,10 +69,10 @@ class BlackHoleVisualizer:
         )
 
     def add_event_horizon(self):
-        u, v = np.mgrid[0:2*np.pi:50j, 0:np.pi:25j]
-        x = self.rs * np.cos(u)*np.sin(v)
-        y = self.rs * np.sin(u)*np.sin(v)
-        z = self.rs * np.cos(v)
+        ux, uy, uz = unit_sphere(60, 30)
+        x = self.rs * ux
+        y = self.rs * uy
+        z = self.rs * uz
 
         self.fig.add_trace(go.Surface(
             x=x+self.position[0],
@@ -54,10 +86,10 @@ class BlackHoleVisualizer:
 
     def add_glow_shell(self):
         glow_radius = 1.2 * self.rs
-        u, v = np.mgrid[0:2*np.pi:60j, 0:np.pi:30j]
-        xg = glow_radius * np.cos(u)*np.sin(v)
-        yg = glow_radius * np.sin(u)*np.sin(v)
-        zg = glow_radius * np.cos(v)
+        ux, uy, uz = unit_sphere(60, 30)
+        xg = glow_radius * ux
+        yg = glow_radius * uy
+        zg = glow_radius * uz
 
         self.fig.add_trace(go.Surface(
             x=xg+self.position[0],
@@ -86,54 +118,62 @@ class BlackHoleVisualizer:
     def add_accretion_disk(self, warp=True, flipped=False):
         inner_radius = 3 * self.rs
         outer_radius = 8 * self.rs
-        radii = np.linspace(inner_radius, outer_radius, 40)
+        radii = np.linspace(inner_radius, outer_radius, 40)[:, None]
 
-        for r in radii:
-            theta = np.linspace(0, 2*np.pi, 300)
-            x = r * np.cos(theta) + self.position[0]
-            y = r * np.sin(theta) + self.position[1]
+        # All rings in one polyline, with a NaN column breaking the line between rings
+        theta = np.linspace(0, 2*np.pi, 300)[None, :]
+        x = radii * np.cos(theta) + self.position[0]
+        y = radii * np.sin(theta) + self.position[1]
 
-            warp_factor = 1 - (inner_radius/r)**0.5
-            z = 1.5 * self.rs * warp_factor * np.sin(2*theta)
-            if flipped:
-                z *= -1
+        warp_factor = 1 - (inner_radius/radii)**0.5
+        z = 1.5 * self.rs * warp_factor * np.sin(2*theta)
+        if flipped:
+            z *= -1
+        z = z + self.position[2]
 
-            # Fiery red core and glow
-            core_color = 'rgba(247,55,24,1.0)'   # #F73718 full opacity
-            glow_color = 'rgba(247,55,24,0.3)'   # #F73718 semi-transparent
+        # float32 halves the base64 payload without any visible difference
+        gap = np.full((len(radii), 1), np.nan)
+        x, y, z = (np.hstack([c, gap]).ravel().astype(np.float32) for c in (x, y, z))
 
-            self.fig.add_trace(go.Scatter3d(
-                x=x, y=y, z=z+self.position[2],
-                mode='lines',
-                line=dict(color=core_color, width=14),
-                hoverinfo='none'
-            ))
+        # Fiery red core and glow
+        core_color = 'rgba(247,55,24,1.0)'   # #F73718 full opacity
+        glow_color = 'rgba(247,55,24,0.3)'   # #F73718 semi-transparent
 
-            self.fig.add_trace(go.Scatter3d(
-                x=x, y=y, z=z+self.position[2],
-                mode='lines',
-                line=dict(color=glow_color, width=20),
-                hoverinfo='none'
-            ))
+        self.fig.add_trace(go.Scatter3d(
+            x=x, y=y, z=z,
+            mode='lines',
+            line=dict(color=core_color, width=14),
+            connectgaps=False,
+            hoverinfo='none'
+        ))
 
+        self.fig.add_trace(go.Scatter3d(
+            x=x, y=y, z=z,
+            mode='lines',
+            line=dict(color=glow_color, width=20),
+            connectgaps=False,
+            hoverinfo='none'
+        ))
 
     def add_gravitational_lensing(self):
-        num_stars = 300
-        angles = np.random.uniform(0, 2*np.pi, num_stars)
-        distances = np.random.normal(loc=20*self.rs, scale=3*self.rs, size=num_stars)
-
-        x = distances * np.cos(angles)
-        y = distances * np.sin(angles)
-        z = np.random.uniform(-15*self.rs, 15*self.rs, num_stars)
-
-        def lens_position(pos):
-            dir_to_bh = self.position - pos
-            dist = np.linalg.norm(dir_to_bh)
-            influence = min(0.95, (self.rs/dist)**2)
-            return pos * (1 - influence) + self.position * influence
-
-        lensed_positions = np.array([lens_position(np.array([x[i], y[i], z[i]])) 
-                                  for i in range(num_stars)])
+        stars = self.stars
+        if stars is None:
+            num_stars = self.num_stars
+            angles = np.random.uniform(0, 2*np.pi, num_stars)
+            distances = np.random.normal(loc=20*self.rs, scale=3*self.rs, size=num_stars)
+            stars = np.column_stack([
+                distances * np.cos(angles),
+                distances * np.sin(angles),
+                np.random.uniform(-15*self.rs, 15*self.rs, num_stars)
+            ])
+
+        lensed_positions = lens_positions(np.asarray(stars, dtype=np.float64), self.position, self.rs)
+
+        # Level of detail: favour the strongly lensed stars close to the hole
+        dist = np.linalg.norm(lensed_positions - self.position, axis=1)
+        weights = 1 + np.minimum(1.0, (5*self.rs/dist)**2)
+        lensed_positions = decimate_points(lensed_positions, self.star_budget, weights)
+        lensed_positions = lensed_positions.astype(np.float32)
 
         self.fig.add_trace(go.Scatter3d(
             x=lensed_positions[:,0],
@@ -148,5 +188,13 @@ class BlackHoleVisualizer:
             hoverinfo='none'
         ))
 
+    def figure_stats(self):
+        """Trace count, serialized payload size and build time of the figure"""
+        return {
+            'traces': len(self.fig.data),
+            'json_bytes': len(self.fig.to_json().encode()),
+            'build_seconds': self.build_seconds
+        }
+
     def show(self):
         self.fig.show()
@@ -1,5 +1,17 @@
 # Initialize visualization package
-from .renderer import Renderer
-from .camera import Camera
+# Submodules are imported on first use to keep streamlit, tqdm and numba out of light imports
+import importlib
 
-__all__ = ['Renderer', 'Camera']
\ No newline at end of file
+_exports = {
+    'Renderer': '.renderer',
+    'Camera': '.camera',
+    'RenderService': '.service',
+    'warm_up': '.warmup'
+}
+
+__all__ = list(_exports)
+
+def __getattr__(name):
+    if name in _exports:
+        return getattr(importlib.import_module(_exports[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
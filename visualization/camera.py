@@ -1,6 +1,47 @@
 import numpy as np
+from functools import lru_cache
 from math import sin, cos, radians
 
+@lru_cache(maxsize=8)
+def camera_plane(width, height, fov):
+    """Cached, read-only (height, width, 3) pixel centers on the z=1 image plane
+    
+    These are the unnormalized camera-space directions (x, y, 1); a sub-pixel
+    offset moves x and y linearly, so jitter is a cheap add on top.
+    """
+    aspect_ratio = width / height
+    scale = np.tan(np.radians(fov * 0.5))
+    u = np.arange(width, dtype=np.float64)[None, :]
+    v = np.arange(height, dtype=np.float64)[:, None]
+    
+    plane = np.empty((height, width, 3))
+    plane[..., 0] = (2 * (u + 0.5) / width - 1) * aspect_ratio * scale
+    plane[..., 1] = (1 - 2 * (v + 0.5) / height) * scale
+    plane[..., 2] = 1.0
+    plane.flags.writeable = False
+    return plane
+
+def camera_directions(width, height, fov, jitter=None):
+    """(height, width, 3) unit ray directions in camera space (right, up, forward)
+    
+    Pixel (x, y) gets the ray Camera.get_ray(x + jx, y + jy) would give, with
+    (jx, jy) = jitter[y, x], or no offset when jitter is None.
+    """
+    plane = camera_plane(width, height, fov)
+    if jitter is not None:
+        pitch = 2 * np.tan(np.radians(fov * 0.5)) / height  # Pixel size on the image plane
+        plane = plane.copy()
+        plane[..., 0] += jitter[..., 0] * pitch
+        plane[..., 1] -= jitter[..., 1] * pitch
+    return plane / np.linalg.norm(plane, axis=-1, keepdims=True)
+
+@lru_cache(maxsize=8)
+def camera_grid(width, height, fov):
+    """Cached, read-only camera_directions through the pixel centers"""
+    grid = camera_directions(width, height, fov)
+    grid.flags.writeable = False
+    return grid
+
 class Camera:
     def __init__(self, position=[0, 0, 5], target=[0, 0, 0], up=[0, 1, 0], fov=60):
         self.position = np.array(position, dtype=np.float64)
@@ -9,6 +50,7 @@ class Camera:
         self.fov = fov
         self.yaw = -90.0  # Horizontal rotation
         self.pitch = 0.0  # Vertical rotation
+        self._bundle = None  # ((width, height, fov), basis, world-space directions)
         self.update_vectors()
         
     def update_vectors(self):
@@ -44,6 +86,32 @@ class Camera:
             self.position += self.right * speed
         self.target = self.position + self.forward
     
+    @property
+    def basis(self):
+        """Rows right, up, forward: maps camera-space vectors to world space"""
+        return np.stack([self.right, self.camera_up, self.forward])
+    
+    def get_ray_bundle(self, width, height, jitter=None):
+        """Origin and (height, width, 3) unit directions of every pixel's ray
+        
+        The camera-space grid is cached per (width, height, fov), so a new
+        orientation costs one matrix multiply and a pure translation reuses
+        the previous directions. jitter, an optional (height, width, 2) array
+        of sub-pixel offsets, is added to the cached image plane (see
+        camera_plane) and gives fresh arrays. Unjittered directions are shared
+        and read-only.
+        """
+        basis = self.basis
+        if jitter is not None:
+            return self.position, camera_directions(width, height, self.fov, jitter) @ basis
+        
+        key = (width, height, float(self.fov))
+        if self._bundle is None or self._bundle[0] != key or not np.array_equal(self._bundle[1], basis):
+            directions = camera_grid(*key) @ basis
+            directions.flags.writeable = False
+            self._bundle = (key, basis, directions)
+        return self.position, self._bundle[2]
+    
     def get_ray(self, u, v, width, height):
         aspect_ratio = width / height
         scale = np.tan(np.radians(self.fov * 0.5))
@@ -0,0 +1,84 @@
+import os
+import glob
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from PIL import Image
+from tqdm import tqdm
+from physics.storage import atomic_write
+from visualization.camera import Camera
+
+class CameraPath:
+    def __init__(self, keyframes):
+        """Keyframes are dicts with 'time', 'position', 'yaw', 'pitch' and 'fov'"""
+        self.keyframes = sorted(keyframes, key=lambda k: k['time'])
+        self.times = np.array([k['time'] for k in self.keyframes], dtype=np.float64)
+        self.positions = np.array([k['position'] for k in self.keyframes], dtype=np.float64)
+        self.angles = np.array([[k['yaw'], k['pitch'], k['fov']] for k in self.keyframes],
+                               dtype=np.float64)
+
+    def camera_at(self, t):
+        """Camera linearly interpolated between the keyframes around time t"""
+        position = [np.interp(t, self.times, self.positions[:, k]) for k in range(3)]
+        yaw, pitch, fov = (np.interp(t, self.times, self.angles[:, k]) for k in range(3))
+
+        camera = Camera(position=position, fov=fov)
+        camera.yaw = yaw
+        camera.pitch = max(-89.0, min(89.0, pitch))
+        camera.update_vectors()
+        return camera
+
+    def sample_times(self, num_frames):
+        return np.linspace(self.times[0], self.times[-1], num_frames)
+
+def _open_frame_store(path, shape):
+    """Reuse an existing frame store of the right shape so exports can resume
+
+    A new store starts zeroed, so frame PNGs already next to it belong to
+    another export and are deleted rather than treated as done.
+    """
+    if os.path.exists(path):
+        store = np.load(path, mmap_mode='r+')
+        if store.shape == shape and store.dtype == np.uint8:
+            return store
+        del store  # Release the old mapping before it is overwritten
+    for stale in glob.glob(os.path.join(os.path.dirname(path), 'frame_*.png')):
+        os.remove(stale)
+    return np.lib.format.open_memmap(path, mode='w+', dtype=np.uint8, shape=shape)
+
+def _encode_png(frames, index, path):
+    with atomic_write(path) as f:  # Only complete files count as done on resume
+        Image.fromarray(frames[index]).save(f, format='PNG')
+    return path
+
+def export_sequence(renderer, camera_path, objects, out_dir, num_frames, black_hole=None,
+                    samples_per_pixel=1, encoders=4):
+    """Render a camera flythrough to out_dir/frame_00000.png, ... and frames.npy
+
+    Frames go into a memory-mapped (num_frames, height, width, 3) store and
+    are PNG-encoded on a thread pool while the next frame renders. Frames
+    whose PNG already exists are skipped, so an interrupted export resumes;
+    if frames.npy is missing or has another shape, the export starts over.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    frames = _open_frame_store(os.path.join(out_dir, 'frames.npy'),
+                               (num_frames, renderer.height, renderer.width, 3))
+    paths = [os.path.join(out_dir, f'frame_{i:05d}.png') for i in range(num_frames)]
+
+    with ThreadPoolExecutor(encoders) as pool:
+        pending = []
+        for i, t in enumerate(tqdm(camera_path.sample_times(num_frames), desc="Exporting")):
+            if os.path.exists(paths[i]):
+                continue
+            camera = camera_path.camera_at(t)
+            frames[i] = renderer.render_parallel(objects, black_hole, camera, samples_per_pixel)
+            pending.append(pool.submit(_encode_png, frames, i, paths[i]))
+
+            # Keep the encoder backlog bounded
+            while len(pending) > 2 * encoders:
+                pending.pop(0).result()
+
+        for future in pending:
+            future.result()
+
+    frames.flush()
+    return paths
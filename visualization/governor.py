@@ -0,0 +1,83 @@
+import time
+from collections import deque
+import numpy as np
+from PIL import Image
+from visualization.renderer import Renderer
+
+class FrameGovernor:
+    def __init__(self, renderer, target_frame_time=0.1, settle_time=0.5, scales=(0.25, 0.5, 1.0),
+                 preview_samples=1, full_samples=4, history=5):
+        """Pick a render scale and spp that fit a frame-time budget while the camera moves
+
+        Frame cost is the median seconds per primary ray over the last `history`
+        frames, so one-off stalls such as JIT compilation do not stick. Once
+        the camera has been still for settle_time, frames are rendered at full
+        resolution with full_samples.
+        """
+        self.renderer = renderer
+        self.target_frame_time = target_frame_time
+        self.settle_time = settle_time
+        self.scales = sorted(scales)
+        self.preview_samples = preview_samples
+        self.full_samples = full_samples
+        self.costs = deque(maxlen=history)
+        self.last_motion = None
+        self.last_full = True
+        self._previews = {}
+
+    def notify_camera_moved(self):
+        self.last_motion = time.monotonic()
+
+    @property
+    def settled(self):
+        return self.last_motion is None or time.monotonic() - self.last_motion >= self.settle_time
+
+    @property
+    def needs_refinement(self):
+        """True when the shown frame was a preview and a full frame is now due"""
+        return not self.last_full and self.settled
+
+    def choose(self):
+        """(scale, samples_per_pixel) for the next frame"""
+        if self.settled:
+            return 1.0, self.full_samples
+        if not self.costs:
+            return self.scales[0], self.preview_samples
+
+        cost_per_ray = float(np.median(self.costs))
+        pixels = self.renderer.width * self.renderer.height
+        for samples in range(self.preview_samples, 0, -1):
+            for scale in reversed(self.scales):
+                if cost_per_ray * pixels * scale**2 * samples <= self.target_frame_time:
+                    return scale, samples
+        return self.scales[0], 1
+
+    def _preview_renderer(self, scale):
+        width = max(1, int(self.renderer.width * scale))
+        height = max(1, int(self.renderer.height * scale))
+        preview = self._previews.get((width, height))
+        if preview is None:
+            preview = Renderer(width, height, self.renderer.use_deflection_lut,
+                               self.renderer.bvh_min_objects,
+                               schwarzschild_radius=self.renderer.schwarzschild_radius)
+            self._previews[(width, height)] = preview
+        return preview
+
+    def render(self, objects, black_hole=None, camera=None, disk=None):
+        """Render within budget; returns (display-size image, stats dict)"""
+        scale, samples = self.choose()
+        renderer = self.renderer if scale == 1.0 else self._preview_renderer(scale)
+
+        start = time.perf_counter()
+        image = renderer.render_parallel(objects, black_hole, camera, samples, disk)
+        seconds = time.perf_counter() - start
+
+        self.costs.append(seconds / (renderer.width * renderer.height * samples))
+
+        if renderer is not self.renderer:
+            image = np.asarray(Image.fromarray(image).resize(
+                (self.renderer.width, self.renderer.height), Image.BILINEAR))
+        # A full-scale preview during motion still has preview_samples and needs refining
+        self.last_full = (scale, samples) == (1.0, self.full_samples)
+        return image, {'scale': scale, 'samples_per_pixel': samples, 'seconds': seconds,
+                       'settled': self.settled}
@@ -0,0 +1,60 @@
+import time
+from contextlib import contextmanager, nullcontext
+import numpy as np
+from physics.counters import COUNTER_NAMES
+
+class RenderStats:
+    def __init__(self):
+        """Per-stage wall times and ray counters collected during one render"""
+        self.timings = {}
+        self.counters = dict.fromkeys(COUNTER_NAMES, 0)
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name, seconds):
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def new_counters(self, rows):
+        """Zeroed (rows, len(COUNTER_NAMES)) array for the kernels to fill"""
+        return np.zeros((rows, len(COUNTER_NAMES)), dtype=np.int64)
+
+    def add_counters(self, counters):
+        for name, total in zip(COUNTER_NAMES, np.asarray(counters).reshape(-1, len(COUNTER_NAMES)).sum(axis=0)):
+            self.counters[name] += int(total)
+
+    @property
+    def total_seconds(self):
+        return sum(self.timings.values())
+
+    @property
+    def objects_tested_per_ray(self):
+        """Sphere tests per traced segment (primary rays and bounces)"""
+        return self.counters['objects_tested'] / max(self.counters['bounces'], 1)
+
+    def as_dict(self):
+        return {
+            'timings': dict(self.timings),
+            'counters': dict(self.counters),
+            'objects_tested_per_ray': self.objects_tested_per_ray
+        }
+
+def stage(stats, name):
+    """stats.stage(name), or a no-op context when instrumentation is off"""
+    return nullcontext() if stats is None else stats.stage(name)
+
+def show_render_stats(stats, container=None):
+    """Render a RenderStats as tables in the Streamlit sidebar (or container)"""
+    import streamlit as st
+
+    container = st.sidebar if container is None else container
+    container.subheader("Render statistics")
+    container.table({'stage': list(stats.timings),
+                     'ms': [round(s * 1000, 2) for s in stats.timings.values()]})
+    container.table({'counter': list(stats.counters) + ['objects_tested_per_ray'],
+                     'value': list(stats.counters.values()) + [round(stats.objects_tested_per_ray, 2)]})
\ No newline at end of file
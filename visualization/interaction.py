@@ -3,10 +3,11 @@ import numpy as np
 from visualization.camera import Camera
 
 class InteractionHandler:
-    def __init__(self):
+    def __init__(self, governor=None):
         self.last_mouse_pos = None
         self.rotation_speed = 0.1
         self.move_speed = 0.5
+        self.governor = governor  # Optional FrameGovernor told about camera motion
         
         if 'camera' not in st.session_state:
             st.session_state.camera = Camera()
@@ -18,6 +19,7 @@ class InteractionHandler:
             
             st.session_state.camera.rotate(-dx * self.rotation_speed, 
                                          dy * self.rotation_speed)
+            self._camera_moved()
         
         self.last_mouse_pos = (mouse_x, mouse_y)
     
@@ -29,4 +31,11 @@ class InteractionHandler:
         elif key == "a":
             st.session_state.camera.move("LEFT", self.move_speed)
         elif key == "d":
-            st.session_state.camera.move("RIGHT", self.move_speed)
\ No newline at end of file
+            st.session_state.camera.move("RIGHT", self.move_speed)
+        else:
+            return
+        self._camera_moved()
+    
+    def _camera_moved(self):
+        if self.governor is not None:
+            self.governor.notify_camera_moved()
\ No newline at end of file
@@ -0,0 +1,69 @@
+import hashlib
+import numpy as np
+import streamlit as st
+from physics.raytracing import prepare_objects, accumulate_tile
+
+class ProgressiveRenderer:
+    def __init__(self, renderer, samples_per_pass=2, max_samples=64, key='progressive_render'):
+        """Accumulate samples in st.session_state across reruns until the view changes"""
+        self.renderer = renderer
+        self.samples_per_pass = samples_per_pass
+        self.max_samples = max_samples
+        self.key = key
+    
+    def fingerprint(self, objects_array, black_hole, camera, disk=None):
+        """Cheap digest of everything that invalidates the accumulated samples"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(np.array([self.renderer.width, self.renderer.height, camera.fov],
+                               dtype=np.float64).tobytes())
+        digest.update(np.concatenate([camera.position, camera.forward, camera.camera_up]).tobytes())
+        digest.update(objects_array.tobytes())
+        if black_hole is not None:
+            digest.update(np.append(black_hole.position,
+                                    self.renderer.black_hole_mass(black_hole)).tobytes())
+            digest.update(bytes([self.renderer.deflection_lut(black_hole, camera) is not None]))
+        if disk is not None:
+            digest.update(disk.geometry.tobytes())
+        return digest.hexdigest()
+    
+    def reset(self):
+        st.session_state.pop(self.key, None)
+    
+    @property
+    def converged(self):
+        state = st.session_state.get(self.key)
+        return state is not None and state['samples'] >= self.max_samples
+    
+    def refine(self, objects, black_hole=None, camera=None, disk=None):
+        """Add one pass of samples and return (running-average image, total samples)"""
+        if camera is None:
+            camera = st.session_state.get('camera')
+            if camera is None:
+                from visualization.camera import Camera
+                camera = Camera()
+        
+        objects_array = prepare_objects(objects)
+        fingerprint = self.fingerprint(objects_array, black_hole, camera, disk)
+        state = st.session_state.get(self.key)
+        if state is None or state['fingerprint'] != fingerprint:
+            state = {
+                'fingerprint': fingerprint,
+                'accum': np.zeros((self.renderer.height, self.renderer.width, 3)),
+                'samples': 0
+            }
+            st.session_state[self.key] = state
+        
+        if state['samples'] < self.max_samples:
+            passes = min(self.samples_per_pass, self.max_samples - state['samples'])
+            cam_pos, forward, right, up, bh_pos = self.renderer.view(camera, black_hole)
+            bh_mass = self.renderer.black_hole_mass(black_hole)
+            accumulate_tile(state['accum'], 0, 0, self.renderer.width, self.renderer.height,
+                            cam_pos, forward, right, up, float(camera.fov), passes, objects_array,
+                            bh_pos, float(bh_mass), 3,
+                            self.renderer.deflection_lut(black_hole, camera),
+                            self.renderer.acceleration(objects_array, objects),
+                            self.renderer.disk_arrays(disk))
+            state['samples'] += passes
+        
+        image = np.clip(state['accum'] / state['samples'], 0, 1)
+        return (image * 255).astype(np.uint8), state['samples']
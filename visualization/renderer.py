@@ -1,33 +1,236 @@
 import numpy as np
-from PIL import Image
 from tqdm import tqdm
-import streamlit as st
-from physics.raytracing import trace_ray, prepare_objects
+from physics.raytracing import trace_ray, prepare_objects, render_tile, render_adaptive
+from physics.lensing import load_deflection_table, CRITICAL_IMPACT
+from physics.disk import load_disk_texture
+from physics.bvh import BVH
+from physics.scene import Scene
+from visualization.tiles import render_tiles, TilePool
+from visualization.instrumentation import RenderStats, stage
 
 class Renderer:
-    def __init__(self, width=800, height=600):
+    def __init__(self, width=800, height=600, use_deflection_lut=None, bvh_min_objects=16,
+                 instrument=False, schwarzschild_radius=None):
+        """use_deflection_lut=None picks the lensing table per frame (see deflection_lut)
+        
+        schwarzschild_radius sets the horizon in scene units; by default the
+        black hole's SI radius in metres is read as scene units.
+        """
         self.width = width
         self.height = height
+        self.instrument = instrument  # Fill last_stats on render/render_parallel
+        self.last_stats = None
+        self.use_deflection_lut = use_deflection_lut
+        self.schwarzschild_radius = schwarzschild_radius
+        self.bvh_min_objects = bvh_min_objects  # Crossover from benchmarks.bvh_crossover
+        self._scene_bvh = None  # (scene, structure_version, version, BVH)
+        self._tile_pool = None  # Workers of render_tiles, kept between frames
+    
+    def horizon(self, black_hole):
+        """Schwarzschild radius in scene units, 0 without a black hole"""
+        if black_hole is None:
+            return 0.0
+        if self.schwarzschild_radius is None:
+            return float(black_hole.schwarzschild_radius)
+        return float(self.schwarzschild_radius)
+    
+    def black_hole_mass(self, black_hole):
+        """Mass for the kernels, which derive rs from it, matching horizon()"""
+        if black_hole is None:
+            return 0.0
+        if self.schwarzschild_radius is None:
+            return float(black_hole.mass)
+        return float(self.schwarzschild_radius) * 299792458.0**2 / (2 * 6.67430e-11)
+    
+    def deflection_lut(self, black_hole, camera):
+        """Lensing table for trace_ray, or None for the legacy blend
+        
+        The table captures every ray aimed within CRITICAL_IMPACT * rs of the
+        hole, so a camera inside that radius sees only black. Unless
+        use_deflection_lut forces it, the table is used only when the camera
+        is outside it.
+        """
+        if black_hole is None or self.use_deflection_lut is False:
+            return None
+        if self.use_deflection_lut is None:
+            distance = np.linalg.norm(np.asarray(camera.position) - black_hole.position)
+            if distance <= CRITICAL_IMPACT * self.horizon(black_hole):
+                return None
+        return load_deflection_table()
     
-    def render(self, objects, black_hole=None, camera=None, samples_per_pixel=1):
+    def disk_arrays(self, disk):
+        """(geometry, texture) for trace_ray, or None"""
+        if disk is None:
+            return None
+        return disk.geometry, load_disk_texture()
+    
+    def view(self, camera, black_hole):
+        """Camera position and basis plus black hole position as float64 arrays"""
+        bh_pos = black_hole.position if black_hole else np.zeros(3)
+        return tuple(np.asarray(v, dtype=np.float64) for v in
+                     (camera.position, camera.forward, camera.right, camera.camera_up, bh_pos))
+    
+    def acceleration(self, objects_array, objects=None):
+        """BVH arrays for trace_ray, or None when brute force is cheaper
+        
+        When objects is a Scene the tree is kept between renders: reused while
+        the scene is unchanged, refit after updates and rebuilt after adds or
+        removes.
+        """
+        if self.bvh_min_objects is None or len(objects_array) < self.bvh_min_objects:
+            return None
+        scene = objects if isinstance(objects, Scene) else None
+        if scene is None:
+            return BVH(objects_array).arrays
+        
+        cached = self._scene_bvh
+        if cached is None or cached[0] is not scene or cached[1] != scene.structure_version:
+            bvh = BVH(objects_array)
+        else:
+            bvh = cached[3]
+            if cached[2] != scene.version:
+                bvh.refit(objects_array)
+        self._scene_bvh = (scene, scene.structure_version, scene.version, bvh)
+        return bvh.arrays
+    
+    def render(self, objects, black_hole=None, camera=None, samples_per_pixel=1, disk=None):
+        if camera is None:
+            from visualization.camera import Camera
+            camera = Camera()
+        
+        stats = RenderStats() if self.instrument else None
+        with stage(stats, 'prepare_objects'):
+            objects_array = prepare_objects(objects)
+        cam_pos, forward, right, up, bh_pos = self.view(camera, black_hole)
+        bh_mass = self.black_hole_mass(black_hole)
+        with stage(stats, 'lensing_table'):
+            lut = self.deflection_lut(black_hole, camera)
+        with stage(stats, 'acceleration'):
+            bvh = self.acceleration(objects_array, objects)
+        with stage(stats, 'disk_texture'):
+            disk_arrays = self.disk_arrays(disk)
+        counters = stats.new_counters(1)[0] if stats else None
+        
+        accum = np.zeros((self.height, self.width, 3))
+        with tqdm(total=self.height * samples_per_pixel, desc="Rendering") as progress:
+            for _ in range(samples_per_pixel):
+                with stage(stats, 'ray_generation'):
+                    jitter = np.random.rand(self.height, self.width, 2)
+                    _, directions = camera.get_ray_bundle(self.width, self.height, jitter)
+                with stage(stats, 'tracing'):
+                    for y in range(self.height):
+                        for x in range(self.width):
+                            accum[y, x] += trace_ray(cam_pos, directions[y, x], objects_array,
+                                                     bh_pos, bh_mass, 3, lut, bvh, disk_arrays, counters)
+                        progress.update(1)
+        image = np.clip(accum / samples_per_pixel, 0, 1).astype(np.float32)
+        
+        with stage(stats, 'image_conversion'):
+            image = (image * 255).astype(np.uint8)
+        if stats is not None:
+            stats.add_counters(counters)
+            self.last_stats = stats
+        return image
+    
+    def render_parallel(self, objects, black_hole=None, camera=None, samples_per_pixel=1, disk=None):
+        """Render the whole frame inside one parallel Numba kernel"""
+        if camera is None:
+            from visualization.camera import Camera
+            camera = Camera()
+        
+        stats = RenderStats() if self.instrument else None
+        with stage(stats, 'prepare_objects'):
+            objects_array = prepare_objects(objects)
+        cam_pos, forward, right, up, bh_pos = self.view(camera, black_hole)
+        bh_mass = self.black_hole_mass(black_hole)
+        with stage(stats, 'lensing_table'):
+            lut = self.deflection_lut(black_hole, camera)
+        with stage(stats, 'acceleration'):
+            bvh = self.acceleration(objects_array, objects)
+        with stage(stats, 'disk_texture'):
+            disk_arrays = self.disk_arrays(disk)
+        
+        image = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        args = (image, 0, 0, self.width, self.height, cam_pos, forward, right, up,
+                float(camera.fov), samples_per_pixel, objects_array,
+                bh_pos, float(bh_mass), 3, lut, bvh, disk_arrays)
+        if stats is None:
+            render_tile(*args)
+            return image
+        
+        # Ray generation, intersection, shading, lensing and uint8 conversion all
+        # run fused in the kernel; the counters break down what it did
+        counters = stats.new_counters(self.height)
+        with stats.stage('kernel'):
+            render_tile(*args, counters)
+        stats.add_counters(counters)
+        self.last_stats = stats
+        return image
+    
+    def render_adaptive(self, objects, black_hole=None, camera=None, min_samples=4,
+                        max_samples=64, threshold=0.01, seed=0, return_spp=False, disk=None):
+        """Render with stratified samples plus extra samples only where pixels are noisy
+        
+        min_samples is rounded down to a square number of strata. threshold is
+        the target standard error of pixel luminance. With return_spp=True the
+        per-pixel sample counts are returned too (see spp_heatmap).
+        """
         if camera is None:
             from visualization.camera import Camera
             camera = Camera()
         
         objects_array = prepare_objects(objects)
-        bh_pos = black_hole.position if black_hole else np.zeros(3)
-        bh_mass = black_hole.mass if black_hole else 0.0
+        cam_pos, forward, right, up, bh_pos = self.view(camera, black_hole)
+        bh_mass = self.black_hole_mass(black_hole)
+        strata = max(1, int(np.sqrt(min_samples)))
+        
+        image = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        spp_map = np.zeros((self.height, self.width), dtype=np.int32)
+        render_adaptive(image, spp_map, cam_pos, forward, right, up, float(camera.fov), strata,
+                        max(max_samples, strata * strata), float(threshold), seed,
+                        objects_array, bh_pos, float(bh_mass),
+                        3, self.deflection_lut(black_hole, camera),
+                        self.acceleration(objects_array, objects), self.disk_arrays(disk))
         
-        image = np.zeros((self.height, self.width, 3), dtype=np.float32)
+        if return_spp:
+            return image, spp_map
+        return image
+    
+    def render_tiles(self, objects, black_hole=None, camera=None, samples_per_pixel=1,
+                     tile_size=64, processes=None, cancel_event=None, disk=None):
+        """Render the frame in tiles across a process pool
         
-        for y in tqdm(range(self.height), desc="Rendering"):
-            for x in range(self.width):
-                color = np.zeros(3)
-                for _ in range(samples_per_pixel):
-                    u = x + np.random.rand()
-                    v = y + np.random.rand()
-                    ray_origin, ray_dir = camera.get_ray(u, v, self.width, self.height)
-                    color += trace_ray(ray_origin, ray_dir, objects_array, bh_pos, bh_mass)
-                image[y, x] = np.clip(color / samples_per_pixel, 0, 1)
+        The pool stays up between calls and is restarted only when the frame
+        size, object count or process count changes (see
+        TilePool); close() stops it. Returns None if cancel_event is set before
+        the frame completes.
+        """
+        if camera is None:
+            from visualization.camera import Camera
+            camera = Camera()
         
-        return (image * 255).astype(np.uint8)
\ No newline at end of file
+        objects_array = prepare_objects(objects)
+        cam_pos, forward, right, up, bh_pos = self.view(camera, black_hole)
+        bh_mass = self.black_hole_mass(black_hole)
+        
+        scene = (objects_array, self.acceleration(objects_array, objects))
+        frame = (cam_pos, forward, right, up, float(camera.fov), samples_per_pixel,
+                 bh_pos, float(bh_mass), 3, self.deflection_lut(black_hole, camera) is not None,
+                 disk.geometry if disk is not None else None)
+        scene_version = (objects, objects.version) if isinstance(objects, Scene) else None
+        if self._tile_pool is None:
+            self._tile_pool = TilePool()
+        
+        return render_tiles(self.width, self.height, scene, frame, tile_size, processes,
+                            cancel_event, self._tile_pool, scene_version)
+    
+    def close(self):
+        """Stop the render_tiles worker processes, if any"""
+        if self._tile_pool is not None:
+            self._tile_pool.close()
+
+def spp_heatmap(spp_map, max_samples=None):
+    """Black-red-yellow uint8 image of per-pixel sample counts"""
+    heat = spp_map / (max_samples or max(int(spp_map.max()), 1))
+    rgb = np.stack([np.clip(2 * heat, 0, 1), np.clip(2 * heat - 1, 0, 1), np.zeros_like(heat)], axis=-1)
+    return (rgb * 255).astype(np.uint8)
\ No newline at end of file
@@ -0,0 +1,256 @@
+import asyncio
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing as mp
+import numpy as np
+from physics.raytracing import prepare_objects
+from physics.storage import atomic_save
+from visualization.tiles import available_cores
+
+# Per-process renderers, keyed by (width, height) + RenderService.settings
+_worker_renderers = {}
+
+def _init_worker(threads):
+    from numba import set_num_threads
+    set_num_threads(threads)
+
+def _render_job(job):
+    from visualization.renderer import Renderer
+
+    width, height, settings, objects_array, black_hole, camera, samples_per_pixel, disk = job
+    renderer = _worker_renderers.get((width, height) + settings)
+    if renderer is None:
+        use_deflection_lut, bvh_min_objects, schwarzschild_radius = settings
+        renderer = _worker_renderers[(width, height) + settings] = Renderer(
+            width, height, use_deflection_lut, bvh_min_objects,
+            schwarzschild_radius=schwarzschild_radius)
+    return renderer.render_parallel(objects_array, black_hole, camera, samples_per_pixel, disk)
+
+class FrameCache:
+    def __init__(self, max_bytes=256 * 2**20, path=None, max_disk_bytes=2 * 2**30):
+        """LRU of rendered frames bounded by total size, optionally backed by a directory
+
+        Frames evicted from memory stay on disk (when path is set) until the
+        disk budget evicts them too. Frames are returned read-only because
+        every caller with the same key shares them.
+        """
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()  # key -> frame
+        self._lock = threading.Lock()
+        self.path = path
+        self.max_disk_bytes = max_disk_bytes
+        self.disk_bytes = 0
+        self._disk_entries = OrderedDict()  # key -> file size
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+            files = [f for f in os.listdir(path) if f.endswith('.npy')]
+            for name in sorted(files, key=lambda f: os.path.getmtime(os.path.join(path, f))):
+                size = os.path.getsize(os.path.join(path, name))
+                self._disk_entries[name[:-4]] = size
+                self.disk_bytes += size
+
+    def _file(self, key):
+        return os.path.join(self.path, f'{key}.npy')
+
+    def get(self, key):
+        """Cached frame for key, or None"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            if key not in self._disk_entries:
+                return None
+            self._disk_entries.move_to_end(key)
+        try:
+            frame = np.load(self._file(key))
+        except OSError:
+            return None
+        self._remember(key, frame)
+        return frame
+
+    def put(self, key, frame):
+        frame.flags.writeable = False
+        self._remember(key, frame)
+        if self.path is None:
+            return
+        
+        atomic_save(self._file(key), frame)
+        with self._lock:
+            size = os.path.getsize(self._file(key))
+            self.disk_bytes += size - self._disk_entries.pop(key, 0)
+            self._disk_entries[key] = size
+            while self.disk_bytes > self.max_disk_bytes and len(self._disk_entries) > 1:
+                evicted, evicted_size = self._disk_entries.popitem(last=False)
+                self.disk_bytes -= evicted_size
+                try:
+                    os.remove(self._file(evicted))
+                except OSError:
+                    pass
+
+    def _remember(self, key, frame):
+        frame.flags.writeable = False
+        with self._lock:
+            if frame.nbytes > self.max_bytes:
+                return
+            if key in self._entries:
+                self.total_bytes -= self._entries.pop(key).nbytes
+            self._entries[key] = frame
+            self.total_bytes += frame.nbytes
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.total_bytes -= evicted.nbytes
+
+    def __len__(self):
+        return len(self._entries)
+
+def request_key(objects_array, black_hole, camera, width, height, samples_per_pixel,
+                disk=None, settings=()):
+    """Digest of everything that determines a rendered frame
+
+    settings are the renderer options, see RenderService.settings.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(np.ascontiguousarray(objects_array).tobytes())
+    if black_hole is not None:
+        digest.update(np.float64(black_hole.mass).tobytes())
+        digest.update(np.asarray(black_hole.position, dtype=np.float64).tobytes())
+    for vector in (camera.position, camera.forward, camera.right, camera.camera_up):
+        digest.update(np.asarray(vector, dtype=np.float64).tobytes())
+    if disk is not None:
+        digest.update(disk.geometry.tobytes())
+    digest.update(repr((float(camera.fov), width, height, samples_per_pixel, black_hole is None,
+                        disk is None, tuple(settings))).encode())
+    return digest.hexdigest()
+
+class RenderService:
+    def __init__(self, workers=None, cache=None, use_deflection_lut=None, bvh_min_objects=16,
+                 schwarzschild_radius=None):
+        """Shared render front end: identical requests coalesce, frames are cached
+
+        Requests are hashed with request_key. A request whose frame is cached
+        returns at once, one that matches a render already queued or running
+        waits for that render, and anything else is queued for a pool of
+        `workers` processes. CPU use therefore follows the number of distinct
+        views, not the number of sessions asking for them.
+
+        Await render() from one event loop, or call render_sync() from any
+        thread (e.g. Streamlit sessions), which runs the service on its own
+        background loop.
+
+        use_deflection_lut, bvh_min_objects and schwarzschild_radius configure
+        the worker Renderers, as in Renderer.
+        """
+        self.workers = workers or available_cores()
+        self.cache = FrameCache() if cache is None else cache
+        self.use_deflection_lut = use_deflection_lut
+        self.bvh_min_objects = bvh_min_objects
+        self.schwarzschild_radius = schwarzschild_radius
+        self.stats = {'requests': 0, 'cache_hits': 0, 'coalesced': 0, 'renders': 0}
+        self._executor = None
+        self._queue = None
+        self._consumers = []
+        self._pending = {}  # key -> future of the render in flight
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def settings(self):
+        """Renderer options, part of every request key and job"""
+        return (self.use_deflection_lut, self.bvh_min_objects, self.schwarzschild_radius)
+
+    def _start(self):
+        if self._executor is None:
+            # Split the cores between worker processes so concurrent renders don't oversubscribe
+            threads = max(1, available_cores() // self.workers)
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=mp.get_context('spawn'),
+                                                 initializer=_init_worker, initargs=(threads,))
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._consumers = [asyncio.ensure_future(self._consume()) for _ in range(self.workers)]
+
+    async def _consume(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            key, job, future = await self._queue.get()
+            try:
+                frame = await loop.run_in_executor(self._executor, _render_job, job)
+                self.stats['renders'] += 1
+                self.cache.put(key, frame)
+                future.set_result(frame)
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                self._pending.pop(key, None)
+                self._queue.task_done()
+
+    async def render(self, objects, black_hole=None, camera=None, width=800, height=600,
+                     samples_per_pixel=1, disk=None):
+        """Rendered uint8 frame (read-only, shared) for this scene and view"""
+        if camera is None:
+            from visualization.camera import Camera
+            camera = Camera()
+        
+        self._start()
+        self.stats['requests'] += 1
+        objects_array = prepare_objects(objects)
+        key = request_key(objects_array, black_hole, camera, width, height, samples_per_pixel,
+                          disk, self.settings)
+        
+        frame = self.cache.get(key)
+        if frame is not None:
+            self.stats['cache_hits'] += 1
+            return frame
+        
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[key] = future
+            job = (width, height, self.settings, np.array(objects_array), black_hole,
+                   camera, samples_per_pixel, disk)
+            await self._queue.put((key, job, future))
+        else:
+            self.stats['coalesced'] += 1
+        # Shielded so one caller giving up does not cancel the frame for the others
+        return await asyncio.shield(future)
+
+    def render_sync(self, *args, **kwargs):
+        """Blocking render() for callers outside the service's event loop"""
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever,
+                                                name='render-service', daemon=True)
+                self._thread.start()
+        return asyncio.run_coroutine_threadsafe(self.render(*args, **kwargs), self._loop).result()
+
+    async def _stop_consumers(self):
+        for consumer in self._consumers:
+            consumer.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._consumers = []
+
+    def close(self):
+        """Stop the consumers and worker processes of a service driven by render_sync"""
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self._stop_consumers(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = None
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        self._queue = None
+
+    async def aclose(self):
+        """close() for a service driven by awaiting render() on the caller's loop"""
+        await self._stop_consumers()
+        self.close()
+
+# Process-wide instance shared by all Streamlit sessions; workers start on first use
+render_service = RenderService()
\ No newline at end of file
@@ -0,0 +1,159 @@
+import os
+import weakref
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+from tqdm import tqdm
+from physics.raytracing import render_tile
+from physics.lensing import load_deflection_table
+from physics.disk import load_disk_texture
+
+# Per-process state set up once by the pool initializer
+_worker = {}
+
+def available_cores():
+    """Number of cores this process may run on"""
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def split_tiles(width, height, tile_size):
+    """(x0, y0, x1, y1) tiles covering the frame in row-major order"""
+    return [(x, y, min(x + tile_size, width), min(y + tile_size, height))
+            for y in range(0, height, tile_size)
+            for x in range(0, width, tile_size)]
+
+def _init_worker(layout):
+    from numba import set_num_threads
+    set_num_threads(1)  # Parallelism comes from the pool
+
+    for name, (shm_name, shape, dtype) in layout.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _worker[f'{name}_shm'] = shm
+        _worker[name] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+def _render_worker_tile(task):
+    frame, tile = task
+    (cam_pos, forward, right, up, fov, samples_per_pixel,
+     bh_pos, bh_mass, max_bounces, use_deflection_lut, disk_geometry) = frame
+    bvh = (_worker['nodes'], _worker['indices']) if 'nodes' in _worker else None
+    x0, y0, x1, y1 = tile
+    render_tile(_worker['image'], x0, y0, x1, y1, cam_pos, forward, right, up, fov,
+                samples_per_pixel, _worker['objects'], bh_pos, bh_mass, max_bounces,
+                load_deflection_table() if use_deflection_lut else None, bvh,
+                None if disk_geometry is None else (disk_geometry, load_disk_texture()))
+    return tile
+
+def _release(pool, segments):
+    pool.terminate()
+    pool.join()
+    for shm in segments:
+        shm.close()
+        shm.unlink()
+
+class TilePool:
+    def __init__(self):
+        """Spawn pool and shared-memory scene kept alive across render_tiles calls
+
+        Starting spawn workers and re-importing the kernels costs seconds.
+        The framebuffer, object array and BVH arrays live in shared memory,
+        so the workers are only restarted when their sizes change (frame
+        size, object count, BVH node count or process count).
+        Moved objects are copied in before the frame, skipped when the Scene
+        version has not changed since the last one; the view, black hole,
+        disk and lensing mode travel with each tile. close() stops the
+        workers, as does dropping the pool.
+        """
+        self.layout_key = None
+        self._arrays = None  # name -> shared ndarray
+        self._version = None  # (scene, scene.version) last copied in
+        self._pool = None
+        self._finalizer = None
+
+    def start(self, width, height, scene, processes, scene_version=None):
+        """Pool and framebuffer with the scene arrays copied in
+
+        scene_version, a (Scene, version) pair, lets an unchanged Scene skip
+        the copy.
+        """
+        objects_array, bvh = scene
+        arrays = {'objects': objects_array}
+        if bvh is not None:
+            arrays['nodes'], arrays['indices'] = bvh
+        shapes = {'image': ((height, width, 3), np.dtype(np.uint8))}
+        shapes.update((name, (array.shape, array.dtype)) for name, array in arrays.items())
+        layout_key = (processes, tuple(shapes.items()))
+
+        if layout_key != self.layout_key:
+            self.close()
+            segments = []
+            self._arrays = {}
+            layout = {}
+            for name, (shape, dtype) in shapes.items():
+                size = max(int(np.prod(shape)) * dtype.itemsize, 1)
+                shm = shared_memory.SharedMemory(create=True, size=size)
+                segments.append(shm)
+                self._arrays[name] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+                layout[name] = (shm.name, shape, dtype)
+            self._pool = mp.get_context('spawn').Pool(processes, initializer=_init_worker,
+                                                      initargs=(layout,))
+            # Frees the workers and segments even if close() is never called
+            self._finalizer = weakref.finalize(self, _release, self._pool, segments)
+            self.layout_key = layout_key
+            self._version = None
+
+        unchanged = (scene_version is not None and self._version is not None
+                     and self._version[0] is scene_version[0] and self._version[1] == scene_version[1])
+        if not unchanged:
+            for name, array in arrays.items():
+                self._arrays[name][...] = array
+        self._version = scene_version
+        self._arrays['image'][...] = 0
+        return self._pool, self._arrays['image']
+
+    def close(self):
+        self._arrays = None  # Release the buffer exports before closing
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+        self._pool = None
+        self.layout_key = None
+        self._version = None
+
+def render_tiles(width, height, scene, frame, tile_size=64, processes=None, cancel_event=None,
+                 pool=None, scene_version=None):
+    """Render a frame on a process pool into a shared-memory framebuffer
+
+    scene is (objects_array, bvh), shared with the workers through memory.
+    frame is (cam_pos, forward, right, up, fov, samples_per_pixel, bh_pos,
+    bh_mass, max_bounces, use_deflection_lut, disk_geometry) and is sent
+    with each tile; workers memory-map the deflection table and disk texture
+    themselves (see physics.disk.AccretionDisk). Pass a TilePool to keep the
+    workers between frames; without one the pool lives for this call only,
+    which pays off only for single large frames. Returns the uint8 image,
+    or None if cancel_event was set before all tiles finished.
+    """
+    tiles = split_tiles(width, height, tile_size)
+    processes = min(processes or available_cores(), len(tiles))
+    if frame[-2]:
+        load_deflection_table()  # Build the cache once before workers race for it
+    if frame[-1] is not None:
+        load_disk_texture()
+    owned = pool is None
+    if owned:
+        pool = TilePool()
+
+    completed = False
+    try:
+        workers, image = pool.start(width, height, scene, processes, scene_version)
+        with tqdm(total=len(tiles), desc="Rendering tiles") as progress:
+            for _ in workers.imap_unordered(_render_worker_tile, [(frame, tile) for tile in tiles]):
+                progress.update(1)
+                if cancel_event is not None and cancel_event.is_set():
+                    return None
+        completed = True
+        return image.copy()
+    finally:
+        # Abandoned tiles would keep drawing into the framebuffer, so stop those workers
+        if owned or not completed:
+            pool.close()
\ No newline at end of file
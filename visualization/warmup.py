@@ -0,0 +1,53 @@
+import threading
+import numpy as np
+
+def warm_up(lensing=False, bvh=False, disk=False, background=False):
+    """Compile the render kernels for one renderer configuration
+
+    Pass the configuration in use: whether the deflection table is used
+    (lensing), whether scenes are large enough for a BVH and whether an
+    AccretionDisk is drawn. A tiny Renderer is driven
+    through the same call sites the real renderers use, so the signatures
+    render, render_parallel, render_adaptive and ProgressiveRenderer hit
+    later are already compiled; other configurations compile on first use.
+    With cache=True the machine code lands in __pycache__, so only the
+    first process on a host pays for compilation; later ones just load it.
+    With background=True this runs on a daemon thread that is returned,
+    but compilation holds the GIL, so other threads stall until it ends.
+    """
+    if background:
+        thread = threading.Thread(target=warm_up, args=(lensing, bvh, disk),
+                                  name='kernel-warm-up', daemon=True)
+        thread.start()
+        return thread
+
+    from physics.blackhole import BlackHole
+    from physics.disk import AccretionDisk
+    from physics.objects import CelestialObject
+    from physics.raytracing import prepare_objects, trace_ray, accumulate_tile
+    from visualization.camera import Camera
+    from visualization.renderer import Renderer
+
+    objects = [CelestialObject([0.0, 0.0, -3.0], 1.0, [1.0, 0.0, 0.0])]
+    camera = Camera()
+    black_hole = BlackHole(1e26, [0.0, 0.0, -6.0]) if lensing else None
+    accretion_disk = AccretionDisk(0.5, 3.0) if disk else None
+
+    renderer = Renderer(2, 2, use_deflection_lut=lensing, bvh_min_objects=1 if bvh else None)
+    renderer.render_parallel(objects, black_hole, camera, disk=accretion_disk)
+    renderer.render_adaptive(objects, black_hole, camera, min_samples=1, max_samples=1,
+                             disk=accretion_disk)
+
+    # Renderer.render and ProgressiveRenderer call the kernels from Python
+    objects_array = prepare_objects(objects)
+    cam_pos, forward, right, up, bh_pos = renderer.view(camera, black_hole)
+    bh_mass = renderer.black_hole_mass(black_hole)
+    lut = renderer.deflection_lut(black_hole, camera)
+    acceleration = renderer.acceleration(objects_array)
+    disk_arrays = renderer.disk_arrays(accretion_disk)
+    _, directions = camera.get_ray_bundle(2, 2, np.zeros((2, 2, 2)))
+    trace_ray(cam_pos, directions[0, 0], objects_array, bh_pos, bh_mass, 3, lut, acceleration,
+              disk_arrays, None)
+    accumulate_tile(np.zeros((2, 2, 3)), 0, 0, 2, 2, cam_pos, forward, right, up,
+                    float(camera.fov), 1, objects_array, bh_pos, float(bh_mass), 3,
+                    lut, acceleration, disk_arrays)
\ No newline at end of file